@@ -1,15 +1,69 @@
-__all__ = ["LogFile", "CPLEX", "GUROBI", "CBC", "CPSAT"]
+__all__ = [
+    "LogFile",
+    "Field",
+    "LogInfo",
+    "CPLEX",
+    "GUROBI",
+    "CBC",
+    "CPSAT",
+    "IncrementalLog",
+    "IncrementalCPLEX",
+    "IncrementalGUROBI",
+    "IncrementalCBC",
+    "follow",
+    "get_info_solvers",
+    "read_dir",
+    "get_info_archive",
+    "get_info_runs",
+]
 
-from .cplex import CPLEX
-from .gurobi import GUROBI
-from .cbc import CBC
-from .cpsat import CPSAT
-from .base import LogFile
+import importlib
 
-__map = dict(CPLEX=CPLEX, GUROBI=GUROBI, CBC=CBC, CPSAT=CPSAT)
+# classes are imported from their module when they are first used,
+# so importing orloge does not import pandas or the parsers that are not used
+__modules = dict(
+    LogFile="base",
+    Field="base",
+    LogInfo="base",
+    CPLEX="cplex",
+    GUROBI="gurobi",
+    CBC="cbc",
+    CPSAT="cpsat",
+    IncrementalLog="incremental",
+    IncrementalCPLEX="incremental",
+    IncrementalGUROBI="incremental",
+    IncrementalCBC="incremental",
+)
+__map = dict(CPLEX="CPLEX", GUROBI="GUROBI", CBC="CBC", CPSAT="CPSAT")
+__incremental_map = dict(
+    CPLEX="IncrementalCPLEX", GUROBI="IncrementalGUROBI", CBC="IncrementalCBC"
+)
 
 
-def get_info_solver(path, solver, **options):
+def __getattr__(name):
+    module = __modules.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    value = getattr(importlib.import_module("." + module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__modules))
+
+
+def get_info_solver(path, solver=None, cache=None, cache_size=None, **options):
+    if cache is not None and not options.get("content", False):
+        from .cache import ParseCache
+
+        return ParseCache(cache, cache_size).get_info_solver(path, solver, **options)
+    if solver is None:
+        from .detection import detect_solver
+
+        solver = detect_solver(path, options.get("content", False))
+        if solver is None:
+            raise ValueError("solver of the log is not recognized")
     my_solver = get_solver(solver)
     if my_solver is None:
         raise ValueError(f"solver {solver} is not recognized")
@@ -17,8 +71,50 @@ def get_info_solver(path, solver, **options):
     return log.get_log_info()
 
 
+def get_info_runs(path, solver=None, **options):
+    if solver is None:
+        from .detection import detect_solver
+
+        solver = detect_solver(path, options.get("content", False))
+        if solver is None:
+            raise ValueError("solver of the log is not recognized")
+    return get_solver(solver).get_info_runs(path, **options)
+
+
 def get_solver(solver):
-    my_solver = __map.get(solver)
-    if my_solver is None:
+    if isinstance(solver, type):
+        # a LogFile subclass, registered with its signatures
+        return solver
+    name = __map.get(solver)
+    if name is None:
         raise ValueError(f"solver {solver} is not recognized")
-    return my_solver
+    return __getattr__(name)
+
+
+def get_incremental_solver(solver):
+    name = __incremental_map.get(solver)
+    if name is None:
+        raise ValueError(f"solver {solver} has no incremental parser")
+    return __getattr__(name)
+
+
+def follow(path, solver, **options):
+    return get_incremental_solver(solver).follow(path, **options)
+
+
+def get_info_solvers(paths, solver=None, **options):
+    from .batch import get_info_solvers
+
+    return get_info_solvers(paths, solver, **options)
+
+
+def read_dir(root, pattern="**/*.out", solver=None, **options):
+    from .batch import read_dir
+
+    return read_dir(root, pattern, solver, **options)
+
+
+def get_info_archive(path, solver=None, pattern="*", **options):
+    from .batch import get_info_archive
+
+    return get_info_archive(path, solver, pattern, **options)
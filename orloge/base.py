@@ -1,13 +1,218 @@
 # /usr/bin/python3
+from __future__ import annotations
 import re
-import pandas as pd
-import numpy as np
+import bisect
+import functools
+import codecs
+import collections
+import itertools
+import mmap
+from collections.abc import Mapping
+from . import compression, detection
+from .formats import progress_formats
+from .sampling import ProgressSampler, to_number
 from .constants import (
     LpSolutionOptimal,
     LpSolutionIntegerFeasible,
     LpSolutionNoSolutionFound,
     solver_to_solution,
 )
+from .lazy import LazyModule
+
+# only imported when a progress table is built
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
+
+
+def memoize(method):
+    """
+    keeps the output of a method of LogFile in the instance,
+    keyed by method and arguments, so it is only computed once per log.
+    Tables, arrays, dictionaries and lists are copied when the method is called
+    from outside the log, because callers can modify them. Memoized methods get
+    the kept value without a copy from each other, so they must not modify it.
+    """
+    if getattr(method, "memoized", False):
+        return method
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        memo = self.__dict__.setdefault("_memo", {})
+        key = (name, args, tuple(sorted(kwargs.items())))
+        # number of memoized methods being computed
+        depth = self.__dict__.get("_depth", 0)
+        if key not in memo:
+            self._depth = depth + 1
+            try:
+                memo[key] = method(self, *args, **kwargs)
+            finally:
+                self._depth = depth
+        value = memo[key]
+        if not depth and (
+            isinstance(value, (dict, list))
+            or type(value).__module__.startswith(("pandas", "numpy"))
+        ):
+            return value.copy()
+        return value
+
+    wrapper.memoized = True
+    return wrapper
+
+
+class Field(object):
+    """
+    Declares a value to extract from the log with a regular expression.
+    In the regex, {0} is replaced by numberSearch, {1} by wordSearch and {2} by number.
+    Other braces are kept, so quantifiers such as {4} or {1,3} can be used
+    (but a quantifier of 0, 1 or 2 has to be written as {0,0}, {1,1} or {2,2}).
+    content_type and pos have the same meaning as in LogFile.apply_regex.
+    num is 0 to take the first occurrence and -1 to take the last one.
+    section is the part of the log to search (see LogFile.get_section_limits).
+    """
+
+    def __init__(
+        self, regex, content_type=None, pos=None, num=0, section=None, flags=0
+    ):
+        if num not in [0, -1]:
+            raise ValueError("num can only be 0 (first) or -1 (last)")
+        self.regex = regex
+        self.content_type = content_type
+        self.pos = pos
+        self.num = num
+        self.section = section
+        self.flags = flags
+
+
+class LogInfo(Mapping):
+    """
+    Read-only dictionary with the output of LogFile.get_log_info.
+    Each value is computed the first time it is read and then kept,
+    so only the values that are used (and the ones they need) are computed.
+    """
+
+    keys_order = [
+        "version",
+        "solver",
+        "status",
+        "best_bound",
+        "best_solution",
+        "gap",
+        "time",
+        "matrix_post",
+        "matrix",
+        "cut_info",
+        "rootTime",
+        "presolve",
+        "first_relaxed",
+        "progress",
+        "first_solution",
+        "status_code",
+        "sol_code",
+        "nodes",
+    ]
+    # keys that do not depend on the part of the node log that summary_only skips
+    summary_keys = [
+        "version",
+        "solver",
+        "status",
+        "best_bound",
+        "best_solution",
+        "gap",
+        "time",
+        "status_code",
+        "sol_code",
+        "nodes",
+    ]
+
+    def __init__(self, log):
+        self.log = log
+        self.values = {}
+        self._stats = None
+        self._table = None
+        self.getters = dict(
+            version=log.get_version,
+            solver=lambda: log.name,
+            status=lambda: self.get_stats()[0],
+            best_bound=lambda: self.get_stats()[2],
+            best_solution=lambda: self.get_stats()[1],
+            gap=lambda: self.get_stats()[3],
+            time=log.get_time,
+            matrix_post=lambda: log.get_matrix_dict(post=True),
+            matrix=log.get_matrix_dict,
+            cut_info=lambda: log.get_cuts_dict(
+                self.get_table(), self["best_bound"], self["best_solution"]
+            ),
+            rootTime=log.get_root_time,
+            presolve=log.get_lp_presolve,
+            first_relaxed=self.get_first_relaxed,
+            progress=log.get_progress_output,
+            first_solution=self.get_first_solution,
+            status_code=lambda: self.get_stats()[4],
+            sol_code=lambda: self.get_stats()[5],
+            nodes=log.get_nodes,
+        )
+
+    def __getitem__(self, key):
+        if key not in self.values:
+            if key not in self.getters:
+                raise KeyError(key)
+            self.values[key] = self.getters[key]()
+        return self.values[key]
+
+    def __contains__(self, key):
+        return key in self.getters
+
+    def __iter__(self):
+        return iter(self.keys_order)
+
+    def __len__(self):
+        return len(self.keys_order)
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self.log.name)
+
+    def get_stats(self) -> tuple:
+        """
+        :return: tuple of (status, objective, bound, gap_rel, solver_status, solution_status)
+        """
+        if self._stats is not None:
+            return self._stats
+        log = self.log
+        status, objective, bound, gap_rel = log.get_stats()
+        solver_status, solution_status = log.get_status_codes(status, objective)
+        if bound is None and solution_status == LpSolutionOptimal:
+            bound = objective
+        if solution_status == LpSolutionOptimal:
+            gap_rel = 0
+        self._stats = status, objective, bound, gap_rel, solver_status, solution_status
+        return self._stats
+
+    def get_table(self) -> pd.DataFrame:
+        """
+        :return: the progress table as a pandas dataframe, to compute the values
+            that depend on it. It is the progress value with the default progress_format.
+        """
+        if self.log.options.get("progress_format", "pandas") == "pandas":
+            return self["progress"]
+        if self._table is None:
+            self._table = self.log.get_progress_info()
+        return self._table
+
+    def get_first_relaxed(self) -> float | None:
+        progress = self.get_table()
+        if not len(progress):
+            return None
+        return self.log.get_first_relax(progress)
+
+    def get_first_solution(self) -> dict | None:
+        progress = self.get_table()
+        if not len(progress) or self["sol_code"] not in [
+            LpSolutionIntegerFeasible,
+            LpSolutionOptimal,
+        ]:
+            return None
+        return self.log.get_first_solution(progress)
 
 
 class LogFile(object):
@@ -17,29 +222,478 @@ class LogFile(object):
     """
 
     name = None
+    number = r"-?[\de\.\+]+"
+    numberSearch = r"({})".format(number)
+    wordSearch = r"([\w, -]+)"
+    # values to extract from the log, as a dictionary of name: Field.
+    # All fields that search the same section are filled in a single scan.
+    fields = {}
+    # regular expressions that match the first line of each section of the log.
+    # A section ends where the next one found in the log starts.
+    # Everything before the first section found is the "header".
+    section_markers = {}
+    solver_status_map = {}
+    version_regex = ""
+    progress_filter = ""
+    progress_names = []
+    # regular expression that matches the first line of a run,
+    # in logs with several runs (see split_runs)
+    run_marker = None
+    # regular expressions that recognise the logs of a new solver
+    # in their first lines, so it is detected with solver=None
+    signatures = []
+    # typed progress: column with text instead of numbers -> marker column
+    progress_markers = {"Objective": "State", "CutsBestBound": "Cuts"}
+    # summary_only: bytes read at a time from each end of the file
+    summary_block_size = 1 << 16
+    # progress_max_rows: progress lines parsed at a time
+    progress_chunk_size = 10000
+    # methods that are computed once per log (see memoize),
+    # also when a subclass redefines them
+    memoized_methods = [
+        "get_progress",
+        "get_progress_rows",
+        "get_progress_columns",
+        "get_progress_lines",
+        "get_node_log",
+        "get_node_markers",
+        "get_time_column",
+        "get_stats",
+        "get_version",
+        "get_matrix",
+        "get_matrix_post",
+        "get_cuts",
+        "get_cuts_time",
+        "get_lp_presolve",
+        "get_time",
+        "get_nodes",
+        "get_root_time",
+    ]
+    # compiled regular expressions of the class (see compile_patterns)
+    _registry = {}
+    _compiled_fields = {}
+    _line_variants = {}
 
-    def __init__(self, path, **options):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get("signatures"):
+            detection.register(cls.signatures, cls)
+        cls.compile_patterns()
+        for name in cls.memoized_methods:
+            if name in cls.__dict__:
+                setattr(cls, name, memoize(cls.__dict__[name]))
 
+    def __init__(self, path, **options):
+        # position in the content of the part of the node log that
+        # summary_only did not read (see read_summary), or None
+        self.gap = None
         if options.get("content", False):
             content = path
+        elif options.get("summary_only", False):
+            content = self.read_summary(path)
+        elif options.get("mmap", False):
+            content = self.read_mmap(path)
+        elif self.reads_summary(path, options.get("fields")):
+            # the compressed file is not decompressed in memory
+            options = dict(options, summary_only=True)
+            content = self.read_summary(path)
         else:
-            with open(path, "r") as f:
+            with compression.open(path, "r") as f:
                 content = f.read()
 
         self.path = path
-        self.content = content
-        self.number = r"-?[\de\.\+]+"
-        self.numberSearch = r"({})".format(self.number)
-        self.wordSearch = r"([\w, -]+)"
-
-        self.solver_status_map = {}
-        self.version_regex = ""
-        self.progress_filter = ""
-        self.progress_names = []
+        # bytes, memoryview or mmap: patterns are compiled as bytes
+        # and only the matched text is decoded
+        self.binary = not isinstance(content, str)
+        self.content = self.normalize_content(content)
         self.options = options
+        self._sections = None
+        self._fields = {}
+        # results of memoized methods and of apply_regex
+        self._memo = {}
+        self._depth = 0
+        self._matches = {}
+
+    @staticmethod
+    def reads_summary(path, fields) -> bool:
+        """
+        :param fields: the fields option
+        :return: True if the file is compressed and all the fields can be taken
+            from the head and the tail of the log (see read_summary)
+        """
+        return (
+            fields is not None
+            and set(fields) <= set(LogInfo.summary_keys)
+            and compression.get_compression(path) is not None
+        )
+
+    @staticmethod
+    def read_mmap(path):
+        """
+        maps the file in memory instead of reading it.
+        The operating system loads the pages of the file when the regexes scan them.
+        :return: read-only mmap of the file (empty bytes for an empty file)
+        """
+        if compression.get_compression(path) is not None:
+            # a compressed file cannot be mapped: we keep its decompressed bytes
+            with compression.open(path, "rb") as f:
+                return f.read()
+        with open(path, "rb") as f:
+            if not f.seek(0, 2):
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def split_runs(cls, content) -> list:
+        """
+        finds the runs of a log with several runs in a single scan.
+        A run starts at a match of run_marker, unless no section of the log
+        was found since the start of the current run (e.g., a banner and the
+        header of the same run). Without section_markers, every match starts a run.
+        :param content: the log as str, bytes, memoryview or mmap
+        :return: list of (start, end) positions of each run in the content
+        """
+        if cls.run_marker is None:
+            return [(0, len(content))]
+        sections = "|".join(cls.section_markers.values()) or "(?!)"
+        regex = cls.compile(
+            r"(?P<run>{})|(?P<section>{})".format(cls.run_marker, sections),
+            re.MULTILINE,
+            binary=not isinstance(content, str),
+        )
+        starts = [0]
+        in_run = False
+        for match in regex.finditer(content):
+            if match.lastgroup == "section":
+                in_run = True
+            else:
+                if in_run:
+                    starts.append(match.start())
+                in_run = not cls.section_markers
+        return list(zip(starts, starts[1:] + [len(content)]))
+
+    @classmethod
+    def get_info_runs(cls, path, **options) -> list:
+        """
+        parses every run of a log with several runs.
+        The file is memory-mapped (see the mmap option) and read once to split it.
+        :param path: path to the log or, with the content option, the log itself
+        :param options: options for the parser of each run
+        :return: list of (start, end, result) for each run, where start and end
+            are positions in the file (in bytes, or in characters if the content is a str).
+            Runs with Windows new lines are normalized (see normalize_content)
+            after the file is split, so the positions are the ones in the file.
+        """
+        if options.get("content", False):
+            content = path
+        else:
+            content = cls.read_mmap(path)
+        options = dict(options, content=True)
+        options.pop("summary_only", None)
+        if not isinstance(content, str):
+            # views, so we do not copy each run
+            content = memoryview(content)
+        return [
+            (start, end, cls(content[start:end], **options).get_log_info())
+            for start, end in cls.split_runs(content)
+        ]
+
+    @staticmethod
+    def decode(value):
+        """
+        decodes text taken from binary content.
+        Bytes that are not valid UTF-8 are replaced instead of failing.
+        :return: the same value with str instead of bytes, also inside lists and tuples
+        """
+        if isinstance(value, (list, tuple)):
+            return type(value)(LogFile.decode(v) for v in value)
+        if value is None or isinstance(value, str):
+            return value
+        return bytes(value).decode(errors="replace")
+
+    def rfind(self, text) -> int:
+        """
+        :return: position of the last occurrence of text in the content or -1
+        """
+        if not self.binary:
+            return self.content.rfind(text)
+        if not isinstance(self.content, memoryview):
+            return self.content.rfind(text.encode())
+        # memoryview has no rfind and we do not want to copy it
+        pos = -1
+        for match in self.compile(re.escape(text), binary=True).finditer(self.content):
+            pos = match.start()
+        return pos
+
+    def read_summary(self, path) -> str:
+        """
+        reads the beginning of the file until the node log starts
+        and the end of the file, backwards, until the last lines of the node log.
+        The rest of the node log is never read.
+        The file is read completely if these markers cannot be found
+        or the class does not define them.
+        :return: head and tail of the file, joined by a new line
+        """
+        if "nodes" not in self.section_markers or not self.progress_filter:
+            # we cannot tell where the node log is: we read everything
+            with compression.open(path, "r") as f:
+                return f.read()
+        if compression.get_compression(path) is not None:
+            with compression.open(path, "rb") as f:
+                return self.read_summary_stream(f)
+
+        def decode(data):
+            return self.normalize_lines(data.decode(errors="replace"))
+
+        block_size = self.summary_block_size
+        nodes = self.compile(self.section_markers["nodes"], re.MULTILINE)
+        # (?!) never matches
+        summary = self.compile(
+            self.section_markers.get("summary", "(?!)"), re.MULTILINE
+        )
+        node_line = self.compile(self.progress_filter, re.MULTILINE)
+        with open(path, "rb") as f:
+            size = f.seek(0, 2)
+            f.seek(0)
+            head = bytearray()
+            head_end = 0
+            while len(head) < size:
+                head += f.read(block_size)
+                # we only search and keep complete lines
+                end = len(head) if len(head) == size else head.rfind(b"\n") + 1
+                lines, head_end = head[head_end:end], max(head_end, end)
+                if nodes.search(decode(lines)):
+                    break
+            tail = []
+            pending = b""
+            position = size
+            summary_found = False
+            while head_end < position:
+                start = max(head_end, position - block_size)
+                f.seek(start)
+                block = f.read(position - start) + pending
+                position = start
+                cut = 0
+                if start > head_end:
+                    # the first line continues before the block
+                    cut = block.find(b"\n") + 1
+                    if not cut:
+                        pending = block
+                        continue
+                pending, lines = block[:cut], block[cut:]
+                tail.append(lines)
+                # the summary is complete once we reach the node log before it
+                text = decode(lines)
+                marker = summary.search(text)
+                summary_found = summary_found or marker is not None
+                end = marker.start() if marker else len(text)
+                if summary_found and node_line.search(text, 0, end):
+                    break
+        head = decode(head[:head_end])
+        tail = decode(b"".join(reversed(tail)))
+        if head_end < position + len(pending):
+            self.gap = len(head)
+            return head + "\n" + tail
+        return head + tail
+
+    @staticmethod
+    def normalize_content(content):
+        """
+        the regexes expect the new lines of a file opened in text mode ("\n").
+        Binary content with "\r" in its first bytes (Windows new lines) is copied
+        with normalized new lines, so it is not mapped in memory any more.
+        :return: the content, normalized if needed
+        """
+        if content is None:
+            return content
+        if isinstance(content, str):
+            if "\r" in content:
+                return LogFile.normalize_lines(content)
+            return content
+        if b"\r" not in bytes(content[: 1 << 16]):
+            return content
+        return bytes(content).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    @staticmethod
+    def normalize_lines(text) -> str:
+        """
+        :return: text with the same new lines as a file opened in text mode
+        """
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def read_summary_stream(self, f) -> str:
+        """
+        read_summary for files that can only be read forwards, such as compressed files.
+        It needs the nodes marker and the progress filter of the class.
+        The whole file is decompressed but only the head and the end of the file are kept:
+        from some lines before the last line of the node log that precedes the summary.
+        :param f: binary file object
+        :return: head and tail of the file, joined by a new line
+        """
+        block_size = self.summary_block_size
+        nodes = self.compile(self.section_markers["nodes"], re.MULTILINE)
+        # (?!) never matches
+        summary = self.compile(
+            self.section_markers.get("summary", "(?!)"), re.MULTILINE
+        )
+        node_line = self.compile(self.progress_filter, re.MULTILINE)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        head, tail, pending = [], collections.deque(), ""
+        in_head, skipped = True, False
+        # positions in the text after the head: start of the next block,
+        # last node line and last node line before a summary marker
+        position = 0
+        last_node = keep = None
+        for block in iter(lambda: f.read(block_size), b""):
+            text = pending + decoder.decode(block)
+            # we only search and keep complete lines
+            cut = text.rfind("\n") + 1
+            text, pending = self.normalize_lines(text[:cut]), text[cut:]
+            if in_head:
+                head.append(text)
+                in_head = nodes.search(text) is None
+                continue
+            marker = None
+            for marker in summary.finditer(text):
+                pass
+            end = marker.start() if marker else -1
+            before = last_node
+            for line in node_line.finditer(text):
+                if line.start() < end:
+                    before = position + line.start()
+                last_node = position + line.start()
+            if marker:
+                keep = before
+            tail.append((position, text))
+            position += len(text)
+            # the summary can only start after the last node line we have seen
+            start = last_node if keep is None else keep
+            while (
+                start is not None and tail[0][0] + len(tail[0][1]) < start - block_size
+            ):
+                tail.popleft()
+                skipped = True
+        tail = [text for _, text in tail]
+        pending = self.normalize_lines(pending + decoder.decode(b"", final=True))
+        if in_head:
+            head.append(pending)
+        else:
+            tail.append(pending)
+        head, tail = "".join(head), "".join(tail)
+        if skipped:
+            self.gap = len(head)
+            return head + "\n" + tail
+        return head + tail
+
+    @classmethod
+    def compile_patterns(cls):
+        """
+        fills the registry of compiled regular expressions of the class.
+        It runs once, when the class is created, so parsing a log never builds a regex
+        that was already known: the fields, the progress filter and the variants of the progress lines.
+        """
+        cls._registry = {}
+        cls._compiled_fields = cls.compile_fields()
+        cls._line_variants = cls.compile_line_variants()
+        if cls.progress_filter:
+            cls.compile(cls.progress_filter, re.MULTILINE)
+
+    @classmethod
+    def compile(cls, regex, flags=0, binary=False):
+        """
+        compiles a regular expression and keeps it in the registry of the class.
+        :param binary: compile it to search bytes instead of str
+        :return: the compiled regular expression
+        """
+        key = regex, flags, binary
+        pattern = cls._registry.get(key)
+        if pattern is None:
+            source = regex.encode() if binary else regex
+            pattern = cls._registry[key] = re.compile(source, flags)
+        return pattern
+
+    @classmethod
+    def compile_line_variants(cls) -> dict:
+        """
+        builds the regular expressions for each kind of line in the progress table.
+        :return: dictionary of line kind: compiled regex (see process_line)
+        """
+        return {}
+
+    def get_sections(self) -> dict:
+        """
+        scans the log once to find where each section starts.
+        Instead of matching every line, we look for the closest marker not yet found
+        and continue from there with the rest of the markers.
+        :return: dictionary of section name: (start, end) offsets in the content
+        """
+        if self._sections is not None:
+            return self._sections
+        starts = {}
+        pending = dict(self.section_markers)
+        pos = 0
+        while pending:
+            match = self.search_markers(pending, pos)
+            if match is None:
+                break
+            pos = starts[match.lastgroup] = match.start(match.lastgroup)
+            pending.pop(match.lastgroup)
+        limits = sorted(starts.values()) + [len(self.content)]
+        sections = {"header": (0, limits[0])}
+        for name, start in starts.items():
+            sections[name] = (start, limits[bisect.bisect_right(limits, start)])
+        self._sections = sections
+        return sections
+
+    def search_markers(self, markers, pos=0):
+        """
+        searches the first line from pos that matches one of the markers.
+        :param markers: dictionary of section name: regex
+        :return: match where lastgroup is the name of the section found, or None
+        """
+        if not all(v.startswith("^") for v in markers.values()):
+            regex = "|".join("(?P<{}>{})".format(k, v) for k, v in markers.items())
+            pattern = self.compile(regex, re.MULTILINE, self.binary)
+            return pattern.search(self.content, pos)
+        # searching a new line is much faster than "^" in multiline mode
+        regex = "|".join("(?P<{}>{})".format(k, v[1:]) for k, v in markers.items())
+        if pos == 0:
+            match = self.compile(regex, re.MULTILINE, self.binary).match(self.content)
+            if match is not None:
+                return match
+        pattern = self.compile(r"\n(?:{})".format(regex), re.MULTILINE, self.binary)
+        # the line at pos can still match another marker
+        return pattern.search(self.content, max(pos - 1, 0))
+
+    def get_section_limits(self, section=None) -> tuple[int, int]:
+        """
+        section can be the name of a section or a tuple (first, last) of section names,
+        to cover everything from the start of the first to the end of the last.
+        If a section was not found in the log, we do not restrict the search on that side.
+        :return: tuple with start and end offsets in the content
+        """
+        start, end = 0, len(self.content)
+        if section is None:
+            return start, end
+        if isinstance(section, str):
+            section = section, section
+        first, last = section
+        sections = self.get_sections()
+        if first in sections:
+            start = sections[first][0]
+        if last in sections:
+            end = sections[last][1]
+        return start, end
 
     def apply_regex(
-        self, regex, content_type=None, first=True, pos=None, num=None, **kwargs
+        self,
+        regex,
+        content_type=None,
+        first=True,
+        pos=None,
+        num=None,
+        section=None,
+        **kwargs,
     ):
         """
         regex is the regular expression to apply to the file contents.
@@ -48,19 +702,55 @@ class LogFile(object):
         num means, if there are multiple matches in re.findall, num tells which position to take out.
         if num=-1, we take the last one
         pos means the group we want to take out from all the groups of the relevant match.
-        kwargs are additional parameters to the re.findall function
+        section restricts the search to a part of the log (see get_section_limits).
+        kwargs are additional parameters to the compile function
         :return: a list, a tuple or a single value with type "content_type"
         """
-        solution = re.findall(regex, self.content, **kwargs)
-        if solution is None:
-            return None
+        pattern = self.compile(regex, binary=self.binary, **kwargs)
+        start, end = self.get_section_limits(section)
+        key = (pattern, start, end, first and not num)
+        if key not in self._matches:
+            self._matches[key] = self.find_matches(
+                pattern, start, end, first and not num
+            )
+        solution = list(self._matches[key])
         if not first:
             return solution
         if len(solution) == 0:
             return None
         if num is None:
             num = 0
-        possible_tuple = solution[num]
+        return self.cast_values(solution[num], content_type, pos)
+
+    def find_matches(self, pattern, start, end, first) -> list:
+        """
+        :param first: only the first match is needed
+        :return: list of decoded matches like re.findall
+        """
+        if first:
+            # we only need the first match: no need to scan the rest of the log
+            match = pattern.search(self.content, start, end)
+            if match is None:
+                return []
+            groups = match.groups("")
+            if len(groups) == 0:
+                solution = [match.group(0)]
+            elif len(groups) == 1:
+                solution = [groups[0]]
+            else:
+                solution = [groups]
+        else:
+            solution = pattern.findall(self.content, start, end)
+        if self.binary:
+            solution = self.decode(solution)
+        return solution
+
+    @staticmethod
+    def cast_values(possible_tuple, content_type=None, pos=None):
+        """
+        casts one match of a regular expression (see apply_regex)
+        :return: a list, a tuple or a single value with type "content_type"
+        """
         if type(possible_tuple) is str:
             # we force a tuple to deal with one string lists
             possible_tuple = (possible_tuple,)
@@ -85,16 +775,162 @@ class LogFile(object):
                     ct[i] = _c
             return [func[ct[i]](val) for i, val in enumerate(possible_tuple)]
 
+    @classmethod
+    def compile_fields(cls) -> dict:
+        """
+        builds one regular expression per section with all the fields that search it.
+        Each distinct regex becomes a named alternative; fields that share a regex share it.
+        :return: dictionary of section: (compiled regex, alternatives)
+            where alternatives is a dictionary of group name:
+            (group index, number of groups, field names, regex of the alternative)
+        """
+        flag_letters = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s"}
+        placeholders = dict(zip("012", [cls.numberSearch, cls.wordSearch, cls.number]))
+        by_section = {}
+        for name, field in cls.fields.items():
+            regex = re.sub(
+                r"\{([012])\}", lambda m: placeholders[m.group(1)], field.regex
+            )
+            letters = "".join(l for f, l in flag_letters.items() if field.flags & f)
+            if letters:
+                regex = "(?{}:{})".format(letters, regex)
+            by_section.setdefault(field.section, {}).setdefault(regex, []).append(name)
+        compiled = {}
+        for section, regexes in by_section.items():
+            parts = []
+            alternatives = {}
+            index = 1
+            for i, (regex, names) in enumerate(regexes.items()):
+                group = "f{}".format(i)
+                num_groups = re.compile(regex).groups
+                alternatives[group] = index, num_groups, names, regex
+                parts.append("(?P<{}>{})".format(group, regex))
+                index += num_groups + 1
+            compiled[section] = re.compile("|".join(parts)), alternatives
+        return compiled
+
+    def iter_fields(self, section, content, start=0, end=None):
+        """
+        finds the fields of a section in the content, scanning it once.
+        A field that matches inside the text matched by another field is not seen
+        by the scan, so the other fields are also searched in that text.
+        :param content: text or bytes to search (the log or a part of it)
+        :return: generator of (position, field names, groups),
+            sorted by position
+        """
+        regex, alternatives = self._compiled_fields[section]
+        binary = not isinstance(content, str)
+        if end is None:
+            end = len(content)
+        if binary:
+            regex = self.compile(regex.pattern, binary=True)
+        for match in regex.finditer(content, start, end):
+            index, num_groups, names, _ = alternatives[match.lastgroup]
+            yield match.start(), names, self.get_groups(match, index, num_groups)
+            hidden = []
+            for group, (_, num_groups, names, pattern) in alternatives.items():
+                if group == match.lastgroup:
+                    continue
+                alone = self.compile(pattern, binary=binary)
+                position = match.start()
+                while position < match.end():
+                    found = alone.match(content, position, end)
+                    if found is None:
+                        position += 1
+                        continue
+                    hidden.append(
+                        (position, names, self.get_groups(found, 0, num_groups))
+                    )
+                    position = max(found.end(), position + 1)
+            hidden.sort(key=lambda h: h[0])
+            yield from hidden
+
+    @staticmethod
+    def get_groups(match, index, num_groups):
+        """
+        :param index: index of the group of the alternative (0 for a whole regex)
+        :return: text of the alternative if it has no groups,
+            text of its group if it has one, tuple of texts otherwise
+        """
+        if num_groups == 0:
+            return match.group(index)
+        if num_groups == 1:
+            return match.group(index + 1) or ""
+        return match.groups("")[index : index + num_groups]
+
+    def get_fields(self) -> dict:
+        """
+        extracts all the values declared in the fields attribute.
+        :return: dictionary of field name: value
+        """
+        values = {}
+        for section in self._compiled_fields:
+            values.update(self.get_section_fields(section))
+        return {name: values[name] for name in self.fields}
+
+    def get_section_fields(self, section) -> dict:
+        """
+        extracts the values of the fields that search a section.
+        The section is scanned once, looking for all of its fields at the same time.
+        We stop early if all the fields of the section only need their first occurrence.
+        With summary_only, a value that can be in the part that was not read is None.
+        :return: dictionary of field name: value
+        """
+        if section in self._fields:
+            return self._fields[section]
+        _, alternatives = self._compiled_fields[section]
+        section_fields = [n for _, _, names, _ in alternatives.values() for n in names]
+        only_first = all(self.fields[n].num == 0 for n in section_fields)
+        start, end = self.get_section_limits(section)
+        found = {}
+        positions = {}
+        for position, names, groups in self.iter_fields(
+            section, self.content, start, end
+        ):
+            for name in names:
+                if self.fields[name].num == 0 and name in found:
+                    continue
+                found[name] = groups
+                positions[name] = position
+            if only_first and all(n in found for n in section_fields):
+                break
+        if self.gap is not None and start <= self.gap < end:
+            # the first (or last) match may be in the part that was not read
+            for name, position in positions.items():
+                if (position < self.gap) != (self.fields[name].num == 0):
+                    del found[name]
+        values = {name: None for name in section_fields}
+        for name, groups in found.items():
+            if self.binary:
+                groups = self.decode(groups)
+            field = self.fields[name]
+            values[name] = self.cast_values(groups, field.content_type, field.pos)
+        self._fields[section] = values
+        return values
+
+    def get_field(self, name):
+        """
+        :return: the value of the field or None if it was not found or not declared.
+            Only the section of the field is scanned.
+        """
+        field = self.fields.get(name)
+        if field is None:
+            return None
+        return self.get_section_fields(field.section)[name]
+
     def get_first_relax(self, progress) -> float | None:
         """
         scans the progress table for the initial relaxed solution
         :return: relaxation
         """
         bestBounds = progress.CutsBestBound[~progress.CutsBestBound.isna()]
+        if self.is_typed(progress):
+            if len(bestBounds):
+                return float(bestBounds.iloc[0])
+            return None
 
-        df_filter = bestBounds.apply(
-            lambda x: re.search(r"^\s*{}$".format(self.number), x) is not None
-        )
+        number = self.compile(r"^\s*{}$".format(self.number))
+        df_filter = bestBounds.apply(lambda x: number.search(x) is not None)
         if len(df_filter) > 0 and any(df_filter):
             return float(bestBounds[df_filter].iloc[0])
         return None
@@ -106,6 +942,11 @@ class LogFile(object):
         :return: dictionary with information on the moment of finding integer solution
         """
         vars_extract = ["Node", "NodesLeft", "BestInteger", "CutsBestBound"]
+        if self.is_typed(progress):
+            found = progress[vars_extract][progress.BestInteger.notna()]
+            if len(found):
+                return found.iloc[0].to_dict()
+            return None
         df_filter = progress.BestInteger.fillna("").str.match(
             r"^\s*{}$".format(self.number)
         )
@@ -113,6 +954,8 @@ class LogFile(object):
         df_filter_1e50 = progress.BestInteger.fillna("").str.match(r"^\s*1e\+50$")
         df_filter = np.all([df_filter, ~df_filter_1e50], axis=0)
         if len(df_filter) > 0 and any(df_filter):
+            # the table is the one of get_log_info: the columns are changed in a copy
+            progress = progress[vars_extract].copy()
             for col in vars_extract:
                 floatSearch = r"[+-]?[\d]+(\.[\d]+)?([Ee][+-]?[\d]+)?"
                 regex = "^({}).*$".format(floatSearch)
@@ -121,19 +964,34 @@ class LogFile(object):
             return pd.to_numeric(progress[vars_extract][df_filter].iloc[0]).to_dict()
         return None
 
+    @staticmethod
+    def get_node_numbers(progress) -> tuple[pd.Series, pd.Series]:
+        """
+        :return: tuple of (Node, NodesLeft) columns as numbers (NaN if they are not),
+            read in the same way from text and typed progress tables (see get_progress_typed)
+        """
+        if LogFile.is_typed(progress):
+            return progress.Node, progress.NodesLeft
+        node = pd.to_numeric(progress.Node.str.partition("+")[0], errors="coerce")
+        return node, pd.to_numeric(progress.NodesLeft, errors="coerce")
+
     @staticmethod
     def get_results_after_cuts(progress):
         """
         gets relaxed and integer solutions after the cuts phase has ended.
         :return: tuple of length two
         """
-        df_filter = np.all(
-            (
-                progress.Node.str.match(r"^\*?H?\s*0"),
-                progress.NodesLeft.str.match(r"^\+?H?\s*[012]"),
-            ),
-            axis=0,
-        )
+        node, nodes_left = LogFile.get_node_numbers(progress)
+        df_filter = ((node == 0) & (nodes_left <= 2)).to_numpy()
+        if LogFile.is_typed(progress):
+            if not df_filter.any():
+                return None, None
+            last = progress[df_filter].iloc[-1]
+            relax_value, sol_value = last.CutsBestBound, last.BestInteger
+            return (
+                None if pd.isna(relax_value) else float(relax_value),
+                None if pd.isna(sol_value) else float(sol_value),
+            )
 
         # in case we have some progress after the cuts, we get those values
         # if not, we return None to later fill with best_solution and best_bound
@@ -152,56 +1010,35 @@ class LogFile(object):
 
         return relax_value, sol_value
 
-    def get_log_info(self) -> dict:
+    def get_log_info(self, fields=None) -> dict:
         """
         Main function that builds the general output for every solver
-        :return: a dictionary
+        :param fields: list of keys to compute (with the values they need).
+            By default, the fields option or all the keys.
+        :return: a dictionary, or a LogInfo that computes each value
+            when it is first read if the lazy option is given
         """
-        version = self.get_version()
-        matrix = self.get_matrix_dict()
-        matrix_post = self.get_matrix_dict(post=True)
-        status, objective, bound, gap_rel = self.get_stats()
-        solver_status, solution_status = self.get_status_codes(status, objective)
-        if bound is None and solution_status == LpSolutionOptimal:
-            bound = objective
-        if solution_status == LpSolutionOptimal:
-            gap_rel = 0
-        presolve = self.get_lp_presolve()
-        time_out = self.get_time()
-        nodes = self.get_nodes()
-        root_time = self.get_root_time()
-        if self.options.get("get_progress", True):
-            progress = self.get_progress()
-        else:
-            progress = pd.DataFrame()
-        first_relax = first_solution = None
-        cut_info = self.get_cuts_dict(progress, bound, objective)
+        info = LogInfo(self)
+        if fields is None:
+            fields = self.options.get("fields")
+        if fields is None:
+            if self.options.get("lazy", False):
+                return info
+            return dict(info)
+        for key in fields:
+            if key not in info:
+                raise ValueError(f"field {key} is not recognized")
+        return {key: info[key] for key in fields}
 
-        if len(progress):
-            first_relax = self.get_first_relax(progress)
-            if solution_status in [LpSolutionIntegerFeasible, LpSolutionOptimal]:
-                first_solution = self.get_first_solution(progress)
-
-        return {
-            "version": version,
-            "solver": self.name,
-            "status": status,
-            "best_bound": bound,
-            "best_solution": objective,
-            "gap": gap_rel,
-            "time": time_out,
-            "matrix_post": matrix_post,
-            "matrix": matrix,
-            "cut_info": cut_info,
-            "rootTime": root_time,
-            "presolve": presolve,
-            "first_relaxed": first_relax,
-            "progress": progress,
-            "first_solution": first_solution,
-            "status_code": solver_status,
-            "sol_code": solution_status,
-            "nodes": nodes,
-        }
+    def get_progress_info(self) -> pd.DataFrame:
+        """
+        :return: the progress table of get_log_info (empty if it was not requested)
+        """
+        if self.options.get("get_progress", True) and not self.options.get(
+            "summary_only", False
+        ):
+            return self.get_progress()
+        return pd.DataFrame()
 
     def get_cuts_dict(self, progress, best_bound, best_solution) -> dict:
         """
@@ -242,18 +1079,24 @@ class LogFile(object):
         order = ["constraints", "variables", "nonzeros"]
         return {k: matrix[p] for p, k in enumerate(order)}
 
+    @memoize
     def get_version(self) -> str:
         """
         gets the solver's version
         """
-        return self.apply_regex(self.version_regex)
+        if "version" in self.fields:
+            return self.get_field("version")
+        return self.apply_regex(self.version_regex, section="header")
 
+    @memoize
     def get_matrix(self) -> dict | None:
-        return None
+        return self.get_field("matrix")
 
+    @memoize
     def get_matrix_post(self) -> dict | None:
-        return None
+        return self.get_field("matrix_post")
 
+    @memoize
     def get_stats(self):
         return None, None, None, None
 
@@ -272,39 +1115,271 @@ class LogFile(object):
 
         return solver_status, solution_status
 
+    @memoize
     def get_cuts(self):
         return None
 
+    @memoize
     def get_cuts_time(self) -> float | None:
-        return None
+        return self.get_field("cuts_time")
 
+    @memoize
     def get_lp_presolve(self) -> float | None:
         return None
 
+    @memoize
     def get_time(self) -> float | None:
-        return None
+        return self.get_field("time")
 
+    @memoize
     def get_nodes(self) -> int | None:
-        return None
+        return self.get_field("nodes")
 
+    @memoize
     def get_root_time(self) -> float:
+        return self.get_field("root_time")
+
+    def get_line_kind(self, line):
+        """
+        :param line: progress line
+        :return: key of the line variant (see compile_line_variants) that parses the line
+        """
         return None
 
     def process_line(self, line):
-        return None
+        if not self._line_variants:
+            return None
+        find = self._line_variants[self.get_line_kind(line)].search(line)
+        if not find:
+            return None
+        return find.groups()
 
-    def get_progress(self) -> pd.DataFrame:
+    def parse_lines(self, lines) -> tuple[list, list]:
         """
-        :return: pandas dataframe with 8 columns
+        bulk version of process_line.
+        Lines are grouped by kind and each group is parsed with its own regex,
+        so every regex is only applied to the lines it was written for.
+        Lines that do not match are dropped, the rest keep their order.
+        The lines are still searched one at a time: Series.str.extract and the
+        regexes of pyarrow were not faster and pyarrow gives "" instead of None
+        for the groups that do not match.
+        :return: tuple of (positions of the lines that match, tuples of groups)
+        """
+        lines = list(lines)
+        groups = {}
+        for position, kind in enumerate(map(self.get_line_kind, lines)):
+            groups.setdefault(kind, []).append(position)
+        found = {}
+        for kind, positions in groups.items():
+            matches = map(
+                self._line_variants[kind].search, [lines[p] for p in positions]
+            )
+            found.update((p, m.groups()) for p, m in zip(positions, matches) if m)
+        positions = sorted(found)
+        return positions, [found[p] for p in positions]
+
+    def process_lines(self, lines) -> pd.DataFrame:
+        """
+        :return: pandas dataframe without column names, indexed by line position
+            (see parse_lines)
+        """
+        positions, rows = self.parse_lines(lines)
+        return pd.DataFrame(rows, index=positions)
+
+    def get_progress_lines(self) -> list:
         """
-        lines = self.apply_regex(self.progress_filter, first=False, flags=re.MULTILINE)
+        :return: the lines of the progress table
+        """
+        return self.apply_regex(
+            self.progress_filter, first=False, section="nodes", flags=re.MULTILINE
+        )
+
+    def iter_progress_lines(self):
+        """
+        :return: generator of the lines of the progress table,
+            without keeping them all in memory
+        """
+        regex = self.compile(self.progress_filter, re.MULTILINE, binary=self.binary)
+        start, end = self.get_section_limits("nodes")
+        for match in regex.finditer(self.content, start, end):
+            line = match.group(1)
+            yield self.decode(line) if self.binary else line
+
+    def parse_progress_lines(self, lines) -> tuple[list, list]:
+        """
+        :return: tuple of (positions of the lines that match, tuples of groups)
+        """
+        if self._line_variants and type(self).process_line is LogFile.process_line:
+            return self.parse_lines(lines)
+        # subclasses with their own process_line are parsed line by line
         processed = [self.process_line(line) for line in lines]
-        processed_clean = [p for p in processed if p is not None]
-        progress = pd.DataFrame(processed_clean)
+        positions = [p for p, v in enumerate(processed) if v is not None]
+        return positions, [processed[p] for p in positions]
+
+    def get_progress_sample(self, max_rows) -> tuple[pd.DataFrame, dict]:
+        """
+        reads the progress lines a chunk at a time and only keeps max_rows rows
+        (see orloge.sampling.ProgressSampler).
+        :return: tuple of (pandas dataframe without column names, indexed by line position,
+            dictionary of line position: line for the rows in it)
+        """
+        sampler = ProgressSampler(max_rows)
+        incumbent = self.progress_names.index("BestInteger")
+        bound = self.progress_names.index("CutsBestBound")
+        lines = self.iter_progress_lines()
+        start = 0
+        while True:
+            chunk = list(itertools.islice(lines, self.progress_chunk_size))
+            if not chunk:
+                break
+            for p, row in zip(*self.parse_progress_lines(chunk)):
+                values = to_number(row[incumbent]), to_number(row[bound])
+                sampler.add(start + p, *values, (row, chunk[p]))
+            start += len(chunk)
+        sample = sampler.get_rows()
+        progress = pd.DataFrame(
+            [row for _, (row, _) in sample], index=[p for p, _ in sample]
+        )
+        return progress, {p: line for p, (_, line) in sample}
+
+    @memoize
+    def get_progress_rows(self) -> tuple[list, list]:
+        """
+        parses the progress lines once for the pandas table and for the plain columns.
+        :return: tuple of (positions of the lines that match, tuples of groups)
+        """
+        return self.parse_progress_lines(self.get_progress_lines())
+
+    @memoize
+    def get_progress_columns(self) -> dict:
+        """
+        text progress table as plain lists, without building a pandas dataframe.
+        :return: dictionary of column name: list of str (None when empty)
+        """
+        positions, rows = self.get_progress_rows()
+        return {
+            name: list(values) for name, values in zip(self.progress_names, zip(*rows))
+        }
+
+    def get_progress_output(self):
+        """
+        :return: the progress table of get_log_info in the format of the
+            progress_format option: pandas (default), records, numpy, arrow or polars
+            (see orloge.formats)
+        """
+        progress_format = self.options.get("progress_format", "pandas")
+        if progress_format == "pandas":
+            return self.get_progress_info()
+        to_format = progress_formats.get(progress_format)
+        if to_format is None:
+            raise ValueError(f"progress_format {progress_format} is not recognized")
+        if self.options.get("typed_progress", False) or self.options.get(
+            "progress_max_rows"
+        ):
+            # the conversion to numbers and the sampling are done with pandas
+            progress = self.get_progress_info()
+            categorical = [
+                c
+                for c in progress
+                if isinstance(progress[c].dtype, pd.CategoricalDtype)
+            ]
+            columns = {
+                c: (
+                    progress[c].to_numpy()
+                    if c not in categorical
+                    and pd.api.types.is_numeric_dtype(progress[c])
+                    else progress[c]
+                    .astype("O")
+                    .where(progress[c].notna(), None)
+                    .tolist()
+                )
+                for c in progress
+            }
+            return to_format(columns, categorical)
+        if not self.options.get("get_progress", True) or self.options.get(
+            "summary_only", False
+        ):
+            return to_format({})
+        return to_format(self.get_progress_columns())
+
+    @memoize
+    def get_progress(self) -> pd.DataFrame:
+        """
+        :return: pandas dataframe with 8 columns.
+            With the typed_progress option, columns are numeric (see get_progress_typed)
+            With the progress_max_rows option, only some rows are kept
+            (see get_progress_sample)
+        """
+        max_rows = self.options.get("progress_max_rows")
+        if max_rows is not None:
+            progress, lines = self.get_progress_sample(max_rows)
+        else:
+            lines = self.get_progress_lines()
+            positions, rows = self.get_progress_rows()
+            progress = pd.DataFrame(rows, index=positions)
         if len(progress):
             progress.columns = self.progress_names
+        if self.options.get("typed_progress", False):
+            progress = self.get_progress_typed(progress, lines)
+        if len(progress):
+            progress = self.complete_progress(progress)
+        return progress.reset_index(drop=True)
+
+    def complete_progress(self, progress) -> pd.DataFrame:
+        """
+        adds the columns that do not come from the progress lines.
+        :param progress: progress table indexed by line position
+        :return: progress table
+        """
         return progress
 
+    def get_progress_typed(self, progress, lines) -> pd.DataFrame:
+        """
+        converts the text progress table into numbers.
+        Text printed next to the numbers goes to categorical columns:
+        Heuristic (* or H at the start of the line), NodeMarker (+ after the node),
+        State (infeasible, cutoff or integral instead of an objective)
+        and Cuts (e.g. "Cuts: 12" instead of a bound).
+        :param progress: progress table indexed by position in lines
+        :param lines: the progress lines of the log
+        :return: pandas dataframe with int64 (Node, NodesLeft) and float64 columns
+        """
+        if not len(progress):
+            return progress
+        columns = {}
+        markers = {}
+        for col in progress.columns:
+            values = progress[col]
+            if col == "Node":
+                parts = values.str.partition("+")
+                values, markers["NodeMarker"] = parts[0], parts[1]
+            elif col in ["Gap", "Time"]:
+                # "12.5%" and "35s"
+                values = values.str.rstrip("%s")
+            numbers = pd.to_numeric(values, errors="coerce").astype("float64")
+            if col in ["Node", "NodesLeft"] and not numbers.isna().any():
+                numbers = numbers.astype("int64")
+            if col == "BestInteger":
+                # HACK: CBCs magic number (1e+50) means no integer solution found
+                numbers = numbers.mask(numbers == 1e50)
+            if col in self.progress_markers:
+                markers[self.progress_markers[col]] = values.where(numbers.isna())
+            columns[col] = numbers
+        first = pd.Series([lines[p].lstrip()[:1] for p in progress.index])
+        markers["Heuristic"] = first.where(first.isin(["*", "H"])).values
+        typed = pd.DataFrame(columns, index=progress.index)
+        for col, values in markers.items():
+            values = pd.Series(values, index=progress.index).replace("", None)
+            typed[col] = values.astype("category")
+        return typed
+
+    @staticmethod
+    def is_typed(progress) -> bool:
+        """
+        :return: True if the progress table was built with the typed_progress option
+        """
+        return "Node" in progress and pd.api.types.is_numeric_dtype(progress.Node)
+
 
 if __name__ == "__main__":
     pass
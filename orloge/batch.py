@@ -0,0 +1,298 @@
+"""
+Parsing of many logs in parallel
+(see orloge.get_info_solvers, orloge.read_dir and orloge.get_info_archive).
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import fnmatch
+import glob
+import itertools
+import os
+import signal
+import tarfile
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+from .lazy import LazyModule
+
+# only imported when a summary table is built
+pd = LazyModule("pandas")
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """
+    raises TimeoutError if the block takes more than seconds.
+    Without seconds, or where there are no interval timers (Windows), there is no limit.
+    """
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def stop(signum, frame):
+        raise TimeoutError(f"parsing took more than {seconds} seconds")
+
+    previous = signal.signal(signal.SIGALRM, stop)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def parse_files(items, timeout=None, **options) -> list:
+    """
+    parses some logs, one after the other. This runs in the worker processes.
+    :param items: list of (path, solver) or, for logs in memory,
+        (name, solver, content)
+    :param timeout: seconds to parse each log
+    :return: list of (path, result, error) where error is the exception
+        raised while parsing the log (and result is None) or None
+    """
+    from . import get_info_solver
+
+    results = []
+    for path, solver, *content in items:
+        try:
+            with time_limit(timeout):
+                if content:
+                    info = get_info_solver(content[0], solver, content=True, **options)
+                else:
+                    info = get_info_solver(path, solver, **options)
+                result = dict(info)
+        except Exception as error:
+            results.append((path, None, error))
+        else:
+            results.append((path, result, None))
+    return results
+
+
+def get_info_solvers(
+    paths, solver=None, workers=None, chunksize=1, ordered=True, timeout=None, **options
+):
+    """
+    parses many logs in a pool of processes.
+    :param paths: paths to the logs or (path, solver) tuples
+    :param solver: name of the solver of all the logs.
+        By default, the one of each tuple or the one detected in each log.
+    :param workers: number of processes (by default, the number of CPUs).
+        With 0, the logs are parsed in this process.
+    :param chunksize: number of logs sent to a process at a time
+    :param ordered: if True, results follow the order of paths.
+        If False, they come as soon as they are ready.
+    :param timeout: seconds to parse each log, after which it fails with TimeoutError
+    :param options: options for get_info_solver
+    :return: generator of (path, result, error) for each log, where error is the
+        exception raised while parsing it (and result is None) or None.
+        If a process dies (e.g. killed for lack of memory), the logs it was
+        parsing fail with BrokenProcessPool and the rest are parsed in new processes.
+    """
+    if solver is not None:
+        items = ((path, solver) for path in paths)
+    else:
+        items = (p if isinstance(p, tuple) else (p, None) for p in paths)
+    return parse_items(items, workers, chunksize, ordered, timeout, **options)
+
+
+def parse_items(
+    items, workers=None, chunksize=1, ordered=True, timeout=None, **options
+):
+    """
+    parses the items of parse_files in a pool of processes (see get_info_solvers).
+    :return: generator of (path, result, error)
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+    if workers == 0:
+        for chunk in chunks:
+            yield from parse_files(chunk, timeout, **options)
+        return
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # at most this many chunks are sent and not read, to bound the memory
+    max_pending = 2 * workers
+    # number of each chunk: [future, chunk]. The future is None until it is sent.
+    pending = collections.OrderedDict()
+    # numbers of the chunks that were in a pool that broke (e.g. a process was killed
+    # for lack of memory). They are sent again one at a time, so only the chunk
+    # whose process dies fails.
+    suspects = []
+    numbers = itertools.count()
+    pool = concurrent.futures.ProcessPoolExecutor(workers)
+    try:
+        while True:
+            if suspects:
+                running = any(
+                    f is not None and not f.done() for f, _ in pending.values()
+                )
+                sent = [] if running else suspects[:1]
+            else:
+                sent = []
+                for chunk in itertools.islice(chunks, max_pending - len(pending)):
+                    number = next(numbers)
+                    pending[number] = [None, chunk]
+                    sent.append(number)
+            broken = False
+            for number in sent:
+                try:
+                    future = pool.submit(
+                        parse_files, pending[number][1], timeout, **options
+                    )
+                except BrokenProcessPool:
+                    broken = True
+                    break
+                pending[number][0] = future
+                if number in suspects:
+                    suspects.remove(number)
+            if not broken:
+                if not pending:
+                    return
+                if ordered:
+                    done = [pending[next(iter(pending))][0]]
+                else:
+                    done, _ = concurrent.futures.wait(
+                        [f for f, _ in pending.values() if f is not None],
+                        return_when=concurrent.futures.FIRST_COMPLETED,
+                    )
+                numbers_done = {f: n for n, (f, _) in pending.items() if f in done}
+                for future in done:
+                    if isinstance(future.exception(), BrokenProcessPool):
+                        broken = True
+                        continue
+                    chunk = pending.pop(numbers_done[future])[1]
+                    try:
+                        results = future.result()
+                    except Exception as error:
+                        # the results could not be sent back
+                        results = [(item[0], None, error) for item in chunk]
+                    yield from results
+            if broken:
+                # after the shutdown, all the chunks in the pool are finished or failed
+                pool.shutdown()
+                pool = concurrent.futures.ProcessPoolExecutor(workers)
+                lost = [
+                    n
+                    for n, (f, _) in pending.items()
+                    if f is not None and isinstance(f.exception(), BrokenProcessPool)
+                ]
+                if len(lost) == 1:
+                    # it was the only chunk in the pool: its process died
+                    future, chunk = pending[lost[0]]
+                    failed = concurrent.futures.Future()
+                    failed.set_result(
+                        [(item[0], None, future.exception()) for item in chunk]
+                    )
+                    pending[lost[0]][0] = failed
+                else:
+                    for number in lost:
+                        pending[number][0] = None
+                # the chunks that are not in a pool
+                suspects = [n for n, (f, _) in pending.items() if f is None]
+    finally:
+        pool.shutdown()
+
+
+def iter_archive(path, pattern="*"):
+    """
+    reads the files of a tar (also compressed) or zip archive, one after the other.
+    Tar archives are read as a stream, so compressed ones are only decompressed once.
+    :param path: path to the archive
+    :param pattern: glob pattern of the names of the files to read
+    :return: generator of (name, content as bytes)
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and fnmatch.fnmatch(info.filename, pattern):
+                    yield info.filename, archive.read(info)
+        return
+    with tarfile.open(path, "r|*") as archive:
+        for member in archive:
+            if member.isfile() and fnmatch.fnmatch(member.name, pattern):
+                yield member.name, archive.extractfile(member).read()
+
+
+def get_info_archive(
+    path,
+    solver=None,
+    pattern="*",
+    workers=None,
+    chunksize=1,
+    ordered=True,
+    timeout=None,
+    **options,
+):
+    """
+    parses the logs inside a tar or zip archive in a pool of processes,
+    without extracting them to disk.
+    :param path: path to the archive (.tar, .tar.gz, .tar.bz2, .tar.xz or .zip)
+    :param solver: name of the solver of all the logs (by default, detected in each log)
+    :param pattern: glob pattern of the names of the logs in the archive
+    :param options: see get_info_solvers
+    :return: generator of ((path, name), result, error) for each log in the archive
+    """
+    items = (
+        ((path, name), solver, content) for name, content in iter_archive(path, pattern)
+    )
+    return parse_items(items, workers, chunksize, ordered, timeout, **options)
+
+
+def flatten(result, prefix="") -> dict:
+    """
+    flattens the dictionaries inside a result,
+    e.g. {"matrix": {"constraints": 10}} becomes {"matrix.constraints": 10}
+    :param result: output of get_log_info without the progress table
+    :return: dictionary without dictionaries
+    """
+    row = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            row.update(flatten(value, prefix=f"{prefix}{key}."))
+        else:
+            row[prefix + key] = value
+    return row
+
+
+def read_dir(
+    root, pattern="**/*.out", solver=None, workers=None, progress=False, **options
+):
+    """
+    parses all the logs in a directory into a table with one row per log.
+    :param root: directory
+    :param pattern: glob pattern of the logs, relative to root
+    :param solver: name of the solver of all the logs (by default, detected in each log)
+    :param workers: number of processes (see get_info_solvers)
+    :param progress: if True, the progress tables are also returned
+    :param options: options for get_info_solvers and get_info_solver
+    :return: pandas dataframe with the path, the error (if the log could not be parsed)
+        and the flattened result of each log (e.g. a matrix.constraints column).
+        If progress is True, a tuple with the table and a dictionary of path: progress table.
+    """
+    from .base import LogInfo
+
+    if not progress and options.get("fields") is None:
+        # the progress table is not sent back by the processes
+        options["fields"] = [k for k in LogInfo.keys_order if k != "progress"]
+    paths = sorted(glob.glob(os.path.join(glob.escape(root), pattern), recursive=True))
+    rows = []
+    tables = {}
+    for path, result, error in get_info_solvers(paths, solver, workers, **options):
+        row = dict(path=path, error=None if error is None else repr(error))
+        if result is not None:
+            if "progress" in result:
+                tables[path] = result.pop("progress")
+            row.update(flatten(result))
+        rows.append(row)
+    table = pd.DataFrame(rows, columns=None if rows else ["path", "error"])
+    # a dictionary that was None in some logs leaves an empty column
+    nested = [
+        col
+        for col in table.columns
+        if any(c.startswith(col + ".") for c in table.columns)
+    ]
+    table = table.drop(columns=nested)
+    if progress:
+        return table, tables
+    return table
@@ -0,0 +1,177 @@
+"""
+Cache of parsed logs in a SQLite file (see the cache option of get_info_solver).
+Results are stored with pickle, so only use cache files that you created.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+schema = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    size INTEGER,
+    mtime INTEGER,
+    hash TEXT,
+    result BLOB,
+    length INTEGER,
+    access REAL
+)
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser_version() -> str:
+    """
+    :return: hash of the source code of orloge, so any change to the parsers
+        invalidates the results in the cache
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.blake2b(digest_size=16)
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".py"):
+            with open(os.path.join(folder, name), "rb") as f:
+                digest.update(name.encode() + f.read())
+    return digest.hexdigest()
+
+
+def get_hash(path, block_size=1 << 20) -> str:
+    """
+    :return: hash of the content of a file
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParseCache(object):
+    """
+    Results of get_info_solver by (path, solver, options, version of orloge).
+    A result is used while the file has the same size and modification time,
+    or the same content (checked with a hash when the modification time changes).
+    With max_size, the least recently used results are removed
+    when their total size (in bytes) is larger.
+    """
+
+    def __init__(self, path, max_size=None):
+        self.path = path
+        self.max_size = max_size
+        with self.connect() as conn:
+            conn.execute(schema)
+
+    def connect(self) -> sqlite3.Connection:
+        # several processes can share the same file
+        conn = sqlite3.connect(self.path, timeout=60)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def get_key(path, solver, options) -> str:
+        key = [os.path.abspath(path), solver, options, get_parser_version()]
+        text = json.dumps(key, sort_keys=True, default=repr)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def get(self, path, solver, options):
+        """
+        :return: the result in the cache or None if there is none for this file
+        """
+        key = self.get_key(path, solver, options)
+        stat = os.stat(path)
+        conn = self.connect()
+        try:
+            row = conn.execute(
+                "SELECT size, mtime, hash, result FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            size, mtime, content_hash, result = row
+            if size != stat.st_size:
+                return None
+            if mtime != stat.st_mtime_ns:
+                if content_hash != get_hash(path):
+                    return None
+            with conn:
+                conn.execute(
+                    "UPDATE results SET mtime = ?, access = ? WHERE key = ?",
+                    (stat.st_mtime_ns, time.time(), key),
+                )
+        finally:
+            conn.close()
+        return pickle.loads(result)
+
+    def set(self, path, solver, options, result, stat, content_hash):
+        """
+        stores the result of a file
+        :param stat: os.stat of the file before it was parsed
+        :param content_hash: hash of the file before it was parsed
+        """
+        key = self.get_key(path, solver, options)
+        data = pickle.dumps(dict(result), protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        stat.st_size,
+                        stat.st_mtime_ns,
+                        content_hash,
+                        data,
+                        len(data),
+                        time.time(),
+                    ),
+                )
+                if self.max_size is not None:
+                    self.evict(conn)
+        finally:
+            conn.close()
+
+    def evict(self, conn):
+        """
+        removes the least recently used results that do not fit in max_size
+        """
+        rows = conn.execute(
+            "SELECT key, length FROM results ORDER BY access DESC"
+        ).fetchall()
+        total = 0
+        removed = []
+        for key, length in rows:
+            total += length
+            if total > self.max_size:
+                removed.append((key,))
+        conn.executemany("DELETE FROM results WHERE key = ?", removed)
+
+    def clear(self):
+        conn = self.connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM results")
+        finally:
+            conn.close()
+
+    def get_info_solver(self, path, solver, **options):
+        """
+        get_info_solver that reads the result from the cache if it is there
+        and stores it otherwise.
+        """
+        from . import get_info_solver
+
+        result = self.get(path, solver, options)
+        if result is not None:
+            return result
+        stat = os.stat(path)
+        content_hash = get_hash(path)
+        result = dict(get_info_solver(path, solver, **options))
+        # a log that changed while it was parsed is not stored:
+        # the result may not correspond to its size, modification time and hash
+        after = os.stat(path)
+        if (after.st_size, after.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            self.set(path, solver, options, result, stat, content_hash)
+        return result
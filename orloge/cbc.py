@@ -1,4 +1,4 @@
-from .base import LogFile
+from .base import LogFile, Field
 from .constants import (
     LpStatusMemoryLimit,
     LpStatusSolved,
@@ -11,49 +11,70 @@ import re
 
 
 class CBC(LogFile):
-    def __init__(self, path, **options):
-        super().__init__(path, **options)
-        self.name = "CBC"
-        self.solver_status_map = {
-            "Optimal solution found": LpStatusSolved,
-            "Problem is infeasible": LpStatusInfeasible,
-            "Stopped on time limit": LpStatusTimeLimit,
-            "Problem proven infeasible": LpStatusInfeasible,
-            "Problem is unbounded": LpStatusUnbounded,
-            "Pre-processing says infeasible or unbounded": LpStatusInfeasible,
-            "** Current model not valid": LpStatusNotSolved,
-        }
-        self.version_regex = r"Version: (\S+)"
-        self.progress_names = [
-            "Node",
-            "NodesLeft",
-            "BestInteger",
-            "CutsBestBound",
-            "Time",
-        ]
-        self.progress_filter = r"(^Cbc0010I.*$)"
+    name = "CBC"
+    section_markers = dict(
+        presolve=r"^(?:Continuous objective value|Cgl\d{4}I)",
+        root=r"^Cbc00(?:13|31|38)I",
+        nodes=r"^Cbc0010I",
+        cuts=r"^Cbc0014I Cut generator",
+        summary=r"^(?:Cbc000[15]I|Result - )",
+    )
+    run_marker = r"^Welcome to the CBC MILP Solver"
+    fields = dict(
+        version=Field(r"Version: (\S+)", section="header"),
+        matrix=Field(
+            r"Problem .+ has {0} rows, {0} columns and {0} elements",
+            content_type="int",
+            section="header",
+        ),
+        matrix_post=Field(
+            r"Cgl0004I processed model has {0} rows, {0} columns \(\d+ integer "
+            r"\(\d+ of which binary\)\) and {0} elements",
+            content_type="int",
+            section="presolve",
+        ),
+        status=Field(r"Result - {1}", pos=0, section="summary"),
+        objective=Field(
+            r"best objective {0}( \(best possible {0}\))?, took {2} iterations and {2} nodes \({2} seconds\)",
+            section="summary",
+        ),
+        no_solution=Field(r"No feasible solution found", section="summary"),
+        time=Field(
+            r"Total time \(CPU seconds\):\s*{0}",
+            content_type="float",
+            pos=0,
+            section="summary",
+        ),
+        nodes=Field(
+            r"Enumerated nodes:\s*{0}", content_type="int", pos=0, section="summary"
+        ),
+    )
+
+    solver_status_map = {
+        "Optimal solution found": LpStatusSolved,
+        "Problem is infeasible": LpStatusInfeasible,
+        "Stopped on time limit": LpStatusTimeLimit,
+        "Problem proven infeasible": LpStatusInfeasible,
+        "Problem is unbounded": LpStatusUnbounded,
+        "Pre-processing says infeasible or unbounded": LpStatusInfeasible,
+        "** Current model not valid": LpStatusNotSolved,
+    }
+    progress_names = [
+        "Node",
+        "NodesLeft",
+        "BestInteger",
+        "CutsBestBound",
+        "Time",
+    ]
+    progress_filter = r"(^Cbc0010I.*$)"
 
     def get_cuts(self):
         # TODO
         pass
 
-    def get_matrix(self):
-        regex = r"Problem .+ has {0} rows, {0} columns and {0} elements".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="int")
-
-    def get_matrix_post(self):
-        regex = (
-            r"Cgl0004I processed model has {0} rows, {0} columns \(\d+ integer "
-            r"\(\d+ of which binary\)\) and {0} elements".format(self.numberSearch)
-        )
-        return self.apply_regex(regex, content_type="int")
-
     def get_stats(self):
 
-        regex = "Result - {}".format(self.wordSearch)
-        status = self.apply_regex(regex, pos=0)
+        status = self.get_field("status")
         if status is None:
             # no solution found, I still want the status
             for k in self.solver_status_map.keys():
@@ -61,16 +82,13 @@ class CBC(LogFile):
                     return k, None, None, None
         else:
             status = status.strip()
-        regex = r"best objective {0}( \(best possible {0}\))?, took {1} iterations and {1} nodes \({1} seconds\)".format(
-            self.numberSearch, self.number
-        )
-        solution = self.apply_regex(regex)
+        solution = self.get_field("objective")
 
         if solution is None:
             return None, None, None, None
 
         # if solution[0] == '1e+050':
-        if self.apply_regex("No feasible solution found"):
+        if self.get_field("no_solution"):
             objective = None
         else:
             objective = float(solution[0])
@@ -94,28 +112,16 @@ class CBC(LogFile):
         # TODO
         return None
 
-    def get_time(self):
-        regex = r"Total time \(CPU seconds\):\s*{}".format(self.numberSearch)
-        stats = self.apply_regex(regex, content_type="float", pos=0)
-        return stats
-
-    def get_nodes(self):
-        regex = r"Enumerated nodes:\s*{}".format(self.numberSearch)
-        return self.apply_regex(regex, content_type="int", pos=0)
-
     def get_root_time(self):
         # TODO
         return None
 
-    def process_line(self, line):
-
+    @classmethod
+    def compile_line_variants(cls):
         keys = ["n", "n_left", "b_int", "b_bound", "time"]
-        args = {k: self.numberSearch for k in keys}
-        find = re.search(
+        args = {k: cls.numberSearch for k in keys}
+        regex = re.compile(
             r"Cbc0010I After {n} nodes, {n_left} on tree, {b_int} best solution, "
-            r"best possible {b_bound} \({time} seconds\)".format(**args),
-            line,
+            r"best possible {b_bound} \({time} seconds\)".format(**args)
         )
-        if not find:
-            return None
-        return find.groups()
+        return {None: regex}
@@ -0,0 +1,210 @@
+"""
+Command line interface to parse many logs in parallel:
+
+    orloge --solver CPLEX --workers 8 --format jsonl logs/ other/*.log > results.jsonl
+
+Each result is written as soon as its log is parsed, so memory does not grow
+with the number of logs. Dictionaries and progress tables are written as JSON text
+in CSV and Parquet cells.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import math
+import os
+import sys
+from . import get_info_solvers
+from .base import LogInfo
+
+# columns of the parquet files that are not numbers
+text_fields = ["path", "error", "version", "solver", "status"]
+code_fields = ["status_code", "sol_code"]
+nested_fields = [
+    "matrix_post",
+    "matrix",
+    "cut_info",
+    "presolve",
+    "progress",
+    "first_solution",
+]
+
+
+def get_paths(inputs, pattern="**/*.out"):
+    """
+    :param inputs: files, directories or glob patterns
+    :param pattern: glob pattern of the logs inside the directories
+    :return: generator of paths. Inputs that match nothing are returned as they are.
+    """
+    for name in inputs:
+        if os.path.isdir(name):
+            yield from sorted(
+                glob.glob(os.path.join(glob.escape(name), pattern), recursive=True)
+            )
+        elif os.path.exists(name):
+            yield name
+        else:
+            yield from sorted(glob.glob(name, recursive=True)) or [name]
+
+
+def clean(value):
+    """
+    makes a value of a result valid for JSON: NaN becomes None
+    and numpy numbers become python numbers.
+    """
+    if isinstance(value, dict):
+        return {str(k): clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [clean(v) for v in value]
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def to_text(value):
+    """
+    :return: the value in a CSV or Parquet cell: dictionaries as JSON text
+    """
+    if isinstance(value, dict):
+        return json.dumps(clean(value))
+    return clean(value)
+
+
+class JsonLinesWriter(object):
+    def __init__(self, output, columns):
+        self.output = output
+
+    def write(self, row):
+        self.output.write(json.dumps(clean(row)) + "\n")
+        self.output.flush()
+
+    def close(self):
+        pass
+
+
+class CsvWriter(object):
+    def __init__(self, output, columns):
+        self.output = output
+        self.writer = csv.DictWriter(output, columns)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow({k: to_text(v) for k, v in row.items()})
+        self.output.flush()
+
+    def close(self):
+        pass
+
+
+class ParquetWriter(object):
+    """
+    Writes the rows in row groups of batch_size rows.
+    """
+
+    batch_size = 1000
+
+    def __init__(self, output, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        def get_type(name):
+            if name in text_fields or name in nested_fields:
+                return pa.string()
+            if name in code_fields:
+                return pa.int64()
+            return pa.float64()
+
+        self.pa = pa
+        self.schema = pa.schema([(name, get_type(name)) for name in columns])
+        self.writer = pq.ParquetWriter(output, self.schema)
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append({k: to_text(v) for k, v in row.items()})
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            table = self.pa.Table.from_pylist(self.rows, schema=self.schema)
+            self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+writers = dict(jsonl=JsonLinesWriter, csv=CsvWriter, parquet=ParquetWriter)
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="orloge",
+        description="Extracts the information of solver logs. "
+        "The exit code is 1 if any log could not be parsed.",
+    )
+    parser.add_argument("paths", nargs="+", help="files, directories or globs")
+    parser.add_argument(
+        "--solver",
+        help="CPLEX, GUROBI, CBC or CPSAT (by default, detected in each log)",
+    )
+    parser.add_argument("--pattern", default="**/*.out", help="logs in directories")
+    parser.add_argument("--workers", type=int, help="number of processes")
+    parser.add_argument("--chunksize", type=int, default=1)
+    parser.add_argument("--timeout", type=float, help="seconds for each log")
+    parser.add_argument("--fields", help="comma-separated keys to extract")
+    parser.add_argument("--cache", help="SQLite file with the parsed logs")
+    parser.add_argument("--cache-size", type=int, help="bytes kept in the cache")
+    parser.add_argument("--no-progress", action="store_true", help="no progress table")
+    parser.add_argument("--format", choices=list(writers), default="jsonl")
+    parser.add_argument("--output", "-o", help="file to write (default: stdout)")
+    return parser
+
+
+def main(args=None) -> int:
+    args = get_parser().parse_args(args)
+    if args.fields:
+        fields = args.fields.split(",")
+    else:
+        fields = list(LogInfo.keys_order)
+    if args.no_progress and "progress" in fields:
+        fields.remove("progress")
+    columns = ["path", "error"] + fields
+    paths = get_paths(args.paths, args.pattern)
+    if args.format == "parquet":
+        if args.output is None:
+            sys.exit("orloge: parquet needs --output")
+        output = args.output
+    elif args.output is None:
+        output = sys.stdout
+    else:
+        output = open(args.output, "w", newline="")
+    writer = writers[args.format](output, columns)
+    failed = False
+    try:
+        results = get_info_solvers(
+            paths,
+            args.solver,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            ordered=False,
+            timeout=args.timeout,
+            fields=fields,
+            progress_format="records",
+            cache=args.cache,
+            cache_size=args.cache_size,
+        )
+        for path, result, error in results:
+            row = dict(path=path, error=None if error is None else repr(error))
+            row.update(result or {})
+            writer.write(row)
+            failed = failed or error is not None
+    finally:
+        writer.close()
+        if output is not sys.stdout and not isinstance(output, str):
+            output.close()
+    return int(failed)
@@ -0,0 +1,67 @@
+"""
+Compressed logs (gzip, bz2, xz and zstd), recognised by their first bytes.
+They are decompressed while they are read, never to disk.
+zstd needs the zstandard package (or python 3.14).
+"""
+
+import builtins
+import io
+
+magic_numbers = dict(
+    gzip=b"\x1f\x8b",
+    bz2=b"BZh",
+    xz=b"\xfd7zXZ\x00",
+    zstd=b"\x28\xb5\x2f\xfd",
+)
+
+
+def get_compression(path) -> str | None:
+    """
+    :return: the compression of the file (a key of magic_numbers) or None
+    """
+    with builtins.open(path, "rb") as f:
+        start = f.read(6)
+    for name, magic in magic_numbers.items():
+        if start.startswith(magic):
+            return name
+    return None
+
+
+def open_zstd(path, mode):
+    try:
+        from compression import zstd
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            raise ImportError(f"zstandard is needed to read {path}") from None
+    return zstd.open(path, mode)
+
+
+def open(path, mode="r"):
+    """
+    opens a file, decompressing it if it is compressed.
+    :param mode: "r" (text) or "rb"
+    :return: file object
+    """
+    compression = get_compression(path)
+    if compression is None:
+        return builtins.open(path, mode)
+    if compression == "zstd":
+        f = open_zstd(path, "rb")
+    elif compression == "gzip":
+        import gzip
+
+        f = gzip.open(path, "rb")
+    elif compression == "bz2":
+        import bz2
+
+        f = bz2.open(path, "rb")
+    else:
+        import lzma
+
+        f = lzma.open(path, "rb")
+    if "b" in mode:
+        return f
+    # same new lines as a file opened in text mode
+    return io.TextIOWrapper(f)
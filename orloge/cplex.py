@@ -1,4 +1,4 @@
-from .base import LogFile
+from .base import LogFile, Field
 from .constants import (
     LpStatusMemoryLimit,
     LpStatusSolved,
@@ -8,44 +8,135 @@ from .constants import (
     LpStatusNotSolved,
 )
 import re
-import numpy as np
+from .lazy import LazyModule
+
+# only imported when a progress table is built
+np = LazyModule("numpy")
 
 
 class CPLEX(LogFile):
     # Reference:
     # https://www.ibm.com/support/knowledgecenter/SSSA5P_12.6.3/ilog.odms.cplex.help/CPLEX/UsrMan/topics/discr_optim/mip/para/52_node_log.html
     name = "CPLEX"
+    section_markers = dict(
+        presolve=r"^(?:Tried aggregator|MIP Presolve|LP Presolve|Presolve time|Reduced MIP has)",
+        root=r"^Root relaxation solution time",
+        nodes=r"^\s*Node\s+Left",
+        cuts=r"^[\w ,-]+ cuts applied:",
+        summary=r"^Root node processing",
+    )
+    fields = dict(
+        objective=Field(
+            r"Objective\s+=\s+{0}\s*\n",
+            content_type="float",
+            section="summary",
+            flags=re.MULTILINE,
+        ),
+        gap=Field(
+            r"Current MIP best bound =\s+{0} \(gap = {0}, {0}%\)",
+            content_type="float",
+            section="summary",
+        ),
+        solution_time=Field(
+            r"Solution time =\s+{0} sec\.\s+Iterations = {0}\s+Nodes = {0}",
+            content_type="float",
+            pos=0,
+            section="summary",
+        ),
+        nodes=Field(
+            r"Solution time =\s+{0} sec\.\s+Iterations = {0}\s+Nodes = {0}",
+            content_type="float",
+            pos=2,
+            section="summary",
+        ),
+        total_time=Field(
+            r"Total \(root\+branch&cut\) =\s+{0} sec\. \({0} ticks\)",
+            content_type="float",
+            pos=0,
+            section="summary",
+        ),
+        # TODO: this is not correctly calculated: we need to sum the change to the initial to get
+        #  the original.
+        matrix=Field(
+            r"Reduced MIP has {0} rows, {0} columns, and {0} nonzeros",
+            content_type="int",
+            section=("presolve", "summary"),
+        ),
+        matrix_post=Field(
+            r"Reduced MIP has {0} rows, {0} columns, and {0} nonzeros",
+            content_type="int",
+            num=-1,
+            section=("presolve", "summary"),
+        ),
+        presolve_time=Field(
+            r"Presolve time = {0} sec. \({0} ticks\)",
+            content_type="float",
+            pos=0,
+            section=("presolve", "summary"),
+        ),
+        presolve=Field(
+            r"LP Presolve eliminated {0} rows and {0} columns",
+            content_type="int",
+            section=("presolve", "summary"),
+        ),
+        root_time=Field(
+            r"Root relaxation solution time = {0} sec\. \({0} ticks\)",
+            content_type="float",
+            pos=0,
+            section=("root", "summary"),
+        ),
+        cuts_time=Field(
+            r"Elapsed time = {0} sec\. \({0} ticks, tree = {0} MB, solutions = {0}\)",
+            content_type="float",
+            pos=0,
+            section=("nodes", "summary"),
+        ),
+    )
+
+    solver_status_map = {
+        "MIP - Memory limit exceeded": LpStatusMemoryLimit,
+        "MIP - Integer optimal": LpStatusSolved,
+        "MIP - Integer infeasible.": LpStatusInfeasible,
+        "MIP - Time limit exceeded": LpStatusTimeLimit,
+        "MIP - Integer unbounded": LpStatusUnbounded,
+        "MIP - Integer infeasible or unbounded": LpStatusInfeasible,
+        "CPLEX Error  1001: Out of memory": LpStatusMemoryLimit,
+        "No file read": LpStatusNotSolved,
+    }
+    version_regex = [
+        r"Welcome to IBM\(R\) ILOG\(R\) CPLEX\(R\) Interactive Optimizer (\S+)",
+        r"Log started \((\S+)\)",
+        r"Version identifier: (\S+)",
+    ]
+    header_log_start = ["Welcome to IBM", "Log started"]
+    run_marker = r"^(?:Welcome to IBM|Log started)"
+    progress_names = [
+        "Node",
+        "NodesLeft",
+        "Objective",
+        "IInf",
+        "BestInteger",
+        "CutsBestBound",
+        "ItpNode",
+        "Gap",
+    ]
+    progress_filter = r"(^[\*H]?\s*\d.*$)"
+    # these classify each line of the node log (see process_line)
+    line_heuristic = re.compile(r"\*\s*\d+\+")
+    # TODO: maybe include explicit optioms: Impl Bds, Cuts, ZeroHalf, Flowcuts,
+    line_cuts = re.compile(r"[a-zA-Z\s]+: \d+")
+    line_state = re.compile(r"\*?\s*\d+\+?\s*\d+\s*(infeasible|cutoff|integral)")
+    # line_cuts and line_state are slow on lines without ": " or any of these words
+    line_state_words = re.compile(r"infeasible|cutoff|integral")
+    # these give the time at some points of the node log (see get_time_column)
+    line_elapsed = re.compile(
+        r"Elapsed time = {0} sec. \({0} ticks, tree = {0} MB, solutions = {0}\)".format(
+            LogFile.numberSearch
+        )
+    )
 
     def __init__(self, path, **options):
         super().__init__(path, **options)
-        self.solver_status_map = {
-            "MIP - Memory limit exceeded": LpStatusMemoryLimit,
-            "MIP - Integer optimal": LpStatusSolved,
-            "MIP - Integer infeasible.": LpStatusInfeasible,
-            "MIP - Time limit exceeded": LpStatusTimeLimit,
-            "MIP - Integer unbounded": LpStatusUnbounded,
-            "MIP - Integer infeasible or unbounded": LpStatusInfeasible,
-            "CPLEX Error  1001: Out of memory": LpStatusMemoryLimit,
-            "No file read": LpStatusNotSolved,
-        }
-
-        self.version_regex = [
-            r"Welcome to IBM\(R\) ILOG\(R\) CPLEX\(R\) Interactive Optimizer (\S+)",
-            r"Log started \((\S+)\)",
-            r"Version identifier: (\S+)",
-        ]
-        self.header_log_start = ["Welcome to IBM", "Log started"]
-        self.progress_names = [
-            "Node",
-            "NodesLeft",
-            "Objective",
-            "IInf",
-            "BestInteger",
-            "CutsBestBound",
-            "ItpNode",
-            "Gap",
-        ]
-        self.progress_filter = r"(^[\*H]?\s*\d.*$)"
         # in case of multiple logs in the same file,
         # we choose to get the last one.
         self.content = self.clean_before_last_log()
@@ -54,15 +145,20 @@ class CPLEX(LogFile):
         options = self.header_log_start
         for opt in options:
             # this finds the last occurence of the string
-            pos = self.content.rfind(opt)
+            pos = self.rfind(opt)
             if pos != -1:
+                if self.gap is not None:
+                    self.gap = self.gap - pos if self.gap >= pos else None
+                if self.binary:
+                    # a view, so we do not copy the rest of the file
+                    return memoryview(self.content)[pos:]
                 return self.content[pos:]
         return self.content
 
     def get_version(self):
         result = None
         for reg in self.version_regex:
-            result = self.apply_regex(reg)
+            result = self.apply_regex(reg, section="header")
             if result:
                 return result
         return result
@@ -76,57 +172,30 @@ class CPLEX(LogFile):
     def get_status(self):
         for k in self.solver_status_map.keys():
             search_string = re.escape(k)
-            if self.apply_regex(search_string):
+            if self.apply_regex(search_string, section="summary"):
                 return k
 
     def get_objective(self):
         """
         :return: tuple of length 2
         """
-        regex = r"Objective\s+=\s+{0}\s*\n".format(self.numberSearch)
-        result = self.apply_regex(regex, flags=re.MULTILINE)
-        if result is not None:
-            result = float(result)
-        return result
+        return self.get_field("objective")
 
     def get_gap(self):
         """
         :return: tuple of length 3: bound, absolute gap, relative gap
         """
-        regex = r"Current MIP best bound =\s+{0} \(gap = {0}, {0}%\)".format(
-            self.numberSearch
-        )
-        result = self.apply_regex(regex, content_type="float")
+        result = self.get_field("gap")
         if result is None:
             return None, None, None
         return result
 
-    def get_matrix(self):
-        """
-        :return: tuple of length 3
-        """
-        # TODO: this is not correctly calculated: we need to sum the change to the initial to get
-        #  the original.
-        regex = r"Reduced MIP has {0} rows, {0} columns, and {0} nonzeros".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="int", num=0)
-
-    def get_matrix_post(self):
-        """
-        :return: tuple of length 3
-        """
-        regex = r"Reduced MIP has {0} rows, {0} columns, and {0} nonzeros".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="int", num=-1)
-
     def get_cuts(self):
         """
         :return: dictionary of cuts
         """
         regex = r"{1} cuts applied:  {0}".format(self.numberSearch, self.wordSearch)
-        result = self.apply_regex(regex, first=False)
+        result = self.apply_regex(regex, first=False, section="cuts")
         if result is None:
             return None
         return {k[0]: int(k[1]) for k in result}
@@ -137,64 +206,48 @@ class CPLEX(LogFile):
         """
         # TODO: this is not correctly calculated:
         #  we need to sum the two? preprocessings in my cases
-        regex = r"Presolve time = {0} sec. \({0} ticks\)".format(self.numberSearch)
-        time = self.apply_regex(regex, pos=0, content_type="float")
-
-        regex = r"LP Presolve eliminated {0} rows and {0} columns".format(
-            self.numberSearch
-        )
-        result = self.apply_regex(regex, content_type="int")
+        time = self.get_field("presolve_time")
+        result = self.get_field("presolve")
         if result is None:
             result = None, None
         return {"time": time, "rows": result[0], "cols": result[1]}
 
     def get_time(self):
-        regex = r"Solution time =\s+{0} sec\.\s+Iterations = {0}\s+Nodes = {0}".format(
-            self.numberSearch
-        )
-        result = self.apply_regex(regex, content_type="float", pos=0)
+        result = self.get_field("solution_time")
         if result is not None:
             return result
-        regex = r"Total \(root\+branch&cut\) =\s+{0} sec\. \({0} ticks\)".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="float", pos=0)
-
-    def get_nodes(self):
-        regex = r"Solution time =\s+{0} sec\.\s+Iterations = {0}\s+Nodes = {0}".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="float", pos=2)
+        return self.get_field("total_time")
 
-    def get_root_time(self):
-        regex = r"Root relaxation solution time = {0} sec\. \({0} ticks\)".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, pos=0, content_type="float")
-
-    def get_cuts_time(self):
-        regex = r"Elapsed time = {0} sec\. \({0} ticks, tree = {0} MB, solutions = {0}\)".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="float", pos=0)
+    @classmethod
+    def compile_line_variants(cls):
+        states = ["", "infeasible", "cutoff", "integral"]
+        return {
+            (heuristic, cuts, state): re.compile(
+                cls.get_line_regex(heuristic, cuts, state)
+            )
+            for heuristic in [False, True]
+            for cuts in [False, True]
+            for state in states
+        }
 
-    def process_line(self, line):
+    @classmethod
+    def get_line_regex(cls, heuristic, cuts, state):
+        """
+        :return: the regular expression for a kind of node line
+        """
         keys = ["n", "n_left", "obj", "iinf", "b_int", "b_bound", "ItCnt", "gap"]
-        args = {k: self.numberSearch for k in keys}
-        args["gap"] = "({}%)".format(self.number)
+        args = {k: cls.numberSearch for k in keys}
+        args["gap"] = "({}%)".format(cls.number)
 
-        if re.search(r"\*\s*\d+\+", line):
+        if heuristic:
             args["obj"] = "()"
             args["ItCnt"] = "()"
             args["iinf"] = "()"
 
-        # TODO: maybe include explicit optioms: Impl Bds, Cuts, ZeroHalf, Flowcuts,
-        if re.search(r"[a-zA-Z\s]+: \d+", line):
+        if cuts:
             args["b_bound"] = r"([a-zA-Z\s]+: \d+)"
 
-        get = re.search(r"\*?\s*\d+\+?\s*\d+\s*(infeasible|cutoff|integral)", line)
-        if get is not None:
-            state = get.group(1)
+        if state:
             args["obj"] = "({})".format(state)
             if state in ["integral"]:
                 args["iinf"] = "(0)"
@@ -203,57 +256,111 @@ class CPLEX(LogFile):
             if state in ["cutoff", "infeasible"]:
                 args["b_bound"] += "?"
 
-        find = re.search(
-            r"\s*{n}\s*{n_left}\s+{obj}\s+{iinf}?\s+{b_int}?\s+{b_bound}\s+{ItCnt}\s*{gap}?".format(
-                **args
-            ),
-            line,
+        return r"\s*{n}\s*{n_left}\s+{obj}\s+{iinf}?\s+{b_int}?\s+{b_bound}\s+{ItCnt}\s*{gap}?".format(
+            **args
+        )
+
+    def get_line_kind(self, line):
+        state = None
+        if self.line_state_words.search(line):
+            state = self.line_state.search(line)
+        return (
+            self.line_heuristic.search(line) is not None,
+            ": " in line and self.line_cuts.search(line) is not None,
+            state.group(1) if state is not None else "",
         )
-        if not find:
-            return None
-        return find.groups()
 
-    def get_progress(self):
-        progress = super().get_progress()
-        if len(progress):
+    def complete_progress(self, progress):
+        typed = self.is_typed(progress)
+        try:
+            times = self.get_time_column()[progress.index]
+            if not typed:
+                # we coerce to string to match the other solvers output:
+                times = times.astype("str")
+        except TypeError:
+            times = np.nan if typed else None
+        progress.insert(len(self.progress_names), "Time", times)
+        return progress
+
+    def get_progress_columns(self):
+        # the columns of LogFile are kept: Time is added to a copy
+        columns = dict(super().get_progress_columns())
+        if columns:
             try:
-                times = self.get_time_column()
-                progress["Time"] = times
+                times = self.get_time_column().astype("str").tolist()
             except TypeError:
-                progress["Time"] = None
-        return progress
+                times = [None] * len(columns["Node"])
+            columns["Time"] = times
+        return columns
+
+    def get_progress_lines(self):
+        return self.get_node_log()[0]
+
+    def iter_node_log(self):
+        """
+        reads the node log in a single pass: the progress lines and,
+        between them, the lines with the elapsed time.
+        :return: generator of progress lines (str) and
+            elapsed time lines (tuple of time, ticks, tree MB, solutions)
+        """
+        regex = self.compile(
+            "(?P<row>{})|(?P<elapsed>{})".format(
+                self.progress_filter, self.line_elapsed.pattern
+            ),
+            flags=re.MULTILINE,
+            binary=self.binary,
+        )
+        start, end = self.get_section_limits("nodes")
+        for match in regex.finditer(self.content, start, end):
+            if match.lastgroup == "row":
+                line = match.group("row")
+                yield self.decode(line) if self.binary else line
+            else:
+                values = match.groups()[-self.line_elapsed.groups :]
+                yield tuple(map(float, values))
+
+    def iter_progress_lines(self):
+        for line in self.iter_node_log():
+            if isinstance(line, str):
+                yield line
+
+    def get_node_log(self):
+        """
+        :return: tuple of (progress lines, markers) where markers is a list of
+            (number of progress lines before it, time, ticks, tree MB, solutions)
+        """
+        lines = []
+        markers = []
+        for line in self.iter_node_log():
+            if isinstance(line, str):
+                lines.append(line)
+            else:
+                markers.append((len(lines), *line))
+        return lines, markers
+
+    def get_node_markers(self):
+        """
+        :return: tuple of (number of progress lines, markers), see get_node_log.
+            With the progress_max_rows option, the lines are counted but not kept.
+        """
+        if not self.options.get("progress_max_rows"):
+            lines, markers = self.get_node_log()
+            return len(lines), markers
+        count = 0
+        markers = []
+        for line in self.iter_node_log():
+            if isinstance(line, str):
+                count += 1
+            else:
+                markers.append((count, *line))
+        return count, markers
 
     def get_time_column(self):
         """
         :return: Time column with same length as progress dataframe.
+            The time of the rows between two elapsed time lines is interpolated.
         """
-        regex1 = self.progress_filter
-        args = [self.numberSearch for l in range(4)]
-        regex = (
-            r"Elapsed time = {} sec. \({} ticks, tree = {} MB, solutions = {}\)".format(
-                *args
-            )
-        )
-        end_time = self.get_time()
-        table_start_rx = r"\s*Node"
-        table_start = False
-        i = 0
-        time = [(i, 0)]
-        for l in self.content.split("\n"):
-            if re.search(table_start_rx, l):
-                table_start = True
-            if not table_start:
-                continue
-            if re.search(regex1, l):
-                i += 1
-                continue
-            result = re.search(regex, l)
-            if not result:
-                continue
-            data = result.groups()
-            time.append((i, float(data[0])))
-        time.append((i, end_time))
-        x, y = zip(*time)
-        numbers = np.interp(xp=x, fp=y, x=range(1, x[-1] + 1)).round(2)
-        # we coerce to string to match the other solvers output:
-        return numbers.astype("str")
+        count, markers = self.get_node_markers()
+        x = [0] + [m[0] for m in markers] + [count]
+        y = [0] + [m[1] for m in markers] + [self.get_time()]
+        return np.interp(xp=x, fp=y, x=range(1, x[-1] + 1)).round(2)
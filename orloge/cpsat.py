@@ -2,7 +2,6 @@ from cpsat_logutils.blocks import SearchProgressBlock, SolverBlock, ResponseBloc
 from cpsat_logutils.blocks.search_progress import ModelEvent
 from .base import LogFile
 import cpsat_logutils as cpsatlog
-import pandas as pd
 from .constants import (
     LpStatusMemoryLimit,
     LpStatusSolved,
@@ -15,16 +14,21 @@ from .constants import (
     LpSolutionInfeasible,
     LpSolutionNoSolutionFound,
 )
+from .lazy import LazyModule
+
+# only imported when a progress table is built
+pd = LazyModule("pandas")
 
 
 class CPSAT(LogFile):
     my_parser: cpsatlog.LogParser
     name = "CPSAT"
+    run_marker = r"^Starting CP-SAT solver"
 
     def __init__(self, path, **options):
         super().__init__(path, **options)
 
-        self.my_parser = cpsatlog.LogParser(self.content)
+        self.my_parser = cpsatlog.LogParser(self.decode(self.content))
 
     def get_progress(self):
         """
@@ -43,6 +47,12 @@ class CPSAT(LogFile):
         - NumCons: The number of constraints before the event.
         - RemCons: The number of remaining constraints after the event.
         """
+        return pd.DataFrame(self.get_progress_columns())
+
+    def get_progress_columns(self):
+        """
+        :return: dictionary of column name: list, see get_progress
+        """
         progress_block = self.my_parser.get_block_of_type_or_none(SearchProgressBlock)
         events = progress_block.get_events()
         gap = obj = bound = None
@@ -70,7 +80,8 @@ class CPSAT(LogFile):
             "RemCons",
         ]
 
-        return pd.DataFrame.from_records(my_table, columns=col_names)
+        columns = list(zip(*my_table)) or [()] * len(col_names)
+        return {name: list(values) for name, values in zip(col_names, columns)}
 
     def get_first_relax(self, progress):
         return None
@@ -0,0 +1,69 @@
+"""
+Recognition of the solver of a log from its first lines (see solver=None in get_info_solver).
+"""
+
+import re
+from . import compression
+
+# bytes read from the beginning of a log
+head_size = 1 << 14
+
+# list of (regex on bytes, solver). A solver is a name of orloge.get_solver
+# or a LogFile subclass that sets its signatures attribute (see register).
+# The solver whose regex matches first in the log is chosen.
+signatures = [
+    (
+        rb"Welcome to IBM\(R\) ILOG\(R\) CPLEX|^Log started \(V\d|"
+        rb"^Version identifier: \d|^CPXPARAM_",
+        "CPLEX",
+    ),
+    (rb"Gurobi Optimizer version|^Gurobi \d+\.\d+\.\d+", "GUROBI"),
+    (rb"Starting CP-SAT solver", "CPSAT"),
+    (rb"Welcome to the CBC MILP Solver|^Cbc\d{4}[IWE] |^Coin\d{4}[IWE] ", "CBC"),
+]
+_compiled = []
+
+
+def register(patterns, solver):
+    """
+    adds regular expressions that recognise the logs of a solver.
+    They are tried before the ones that are already registered.
+    :param patterns: list of regular expressions (str or bytes)
+    :param solver: name of the solver or LogFile subclass
+    """
+    for pattern in patterns:
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        signatures.insert(0, (pattern, solver))
+    _compiled.clear()
+
+
+def read_head(path, content=False) -> bytes:
+    """
+    :return: the first bytes of a log (decompressed if needed)
+    """
+    if content:
+        if isinstance(path, str):
+            return path[:head_size].encode(errors="replace")
+        return bytes(path[:head_size])
+    with compression.open(path, "rb") as f:
+        return f.read(head_size)
+
+
+def detect_solver(path, content=False):
+    """
+    :param path: path to the log or, with content, the log itself
+    :return: the solver of the log (see signatures) or None if it is not recognised
+    """
+    if not _compiled:
+        _compiled.extend(
+            (re.compile(pattern, re.MULTILINE), solver)
+            for pattern, solver in signatures
+        )
+    head = read_head(path, content)
+    best, solver = None, None
+    for regex, candidate in _compiled:
+        match = regex.search(head)
+        if match and (best is None or match.start() < best):
+            best, solver = match.start(), candidate
+    return solver
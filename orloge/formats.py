@@ -0,0 +1,75 @@
+"""
+Output formats of the progress table (see the progress_format option).
+Each format is built from a dictionary of column name: values, where values
+is a list (text or categories, None for missing values) or a numpy array (numbers).
+pyarrow and polars are only imported when their format is requested.
+"""
+
+from __future__ import annotations
+from .lazy import LazyModule
+
+# only imported when a progress table is built
+np = LazyModule("numpy")
+
+
+def to_records(columns, categorical=()) -> dict:
+    """
+    :return: dictionary of column name: list
+    """
+    return {
+        name: values.tolist() if isinstance(values, np.ndarray) else list(values)
+        for name, values in columns.items()
+    }
+
+
+def to_numpy(columns, categorical=()) -> np.ndarray:
+    """
+    :return: numpy structured array with one field per column (object for text)
+    """
+    arrays = {
+        name: values if isinstance(values, np.ndarray) else np.array(values, dtype="O")
+        for name, values in columns.items()
+    }
+    length = len(next(iter(arrays.values()))) if arrays else 0
+    table = np.empty(length, dtype=[(n, a.dtype) for n, a in arrays.items()])
+    for name, values in arrays.items():
+        table[name] = values
+    return table
+
+
+def to_arrow(columns, categorical=()):
+    """
+    :return: pyarrow Table, with dictionary encoded categorical columns
+    """
+    import pyarrow as pa
+
+    arrays = {}
+    for name, values in columns.items():
+        if name in categorical:
+            array = pa.array(values, type=pa.string()).dictionary_encode()
+        else:
+            array = pa.array(values, from_pandas=True)
+        arrays[name] = array
+    return pa.table(arrays)
+
+
+def to_polars(columns, categorical=()):
+    """
+    :return: polars DataFrame, with Categorical columns
+    """
+    import polars as pl
+
+    series = []
+    for name, values in columns.items():
+        if name in categorical:
+            series.append(pl.Series(name, values, dtype=pl.Categorical))
+        elif isinstance(values, np.ndarray):
+            series.append(pl.Series(name, values, nan_to_null=True))
+        else:
+            series.append(pl.Series(name, values))
+    return pl.DataFrame(series)
+
+
+progress_formats = dict(
+    records=to_records, numpy=to_numpy, arrow=to_arrow, polars=to_polars
+)
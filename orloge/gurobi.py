@@ -1,4 +1,4 @@
-from .base import LogFile
+from .base import LogFile, Field
 from .constants import (
     LpStatusMemoryLimit,
     LpStatusSolved,
@@ -8,43 +8,98 @@ from .constants import (
     LpStatusNotSolved,
 )
 import re
-import numpy as np
 
 
 class GUROBI(LogFile):
     name = "GUROBI"
-
-    def __init__(self, path, **options):
-        super().__init__(path, **options)
-        self.solver_status_map = {
-            "Optimal solution found": LpStatusSolved,
-            "Solved with barrier": LpStatusSolved,
-            "Model is infeasible": LpStatusInfeasible,
-            "Model is infeasible or unbounded": LpStatusInfeasible,
-            "Time limit reached": LpStatusTimeLimit,
-            "Out of memory": LpStatusMemoryLimit,
-            "ERROR 10001": LpStatusMemoryLimit,
-            "ERROR 10003": LpStatusNotSolved,
-            "^Model is unbounded": LpStatusUnbounded,
-        }
-        self.version_regex = r"Gurobi Optimizer version (\S+)"
-        self.progress_names = [
-            "Node",
-            "NodesLeft",
-            "Objective",
-            "Depth",
-            "IInf",
-            "BestInteger",
-            "CutsBestBound",
-            "Gap",
-            "ItpNode",
-            "Time",
-        ]
-        self.progress_filter = r"(^[\*H]?\s+\d.*$)"
+    section_markers = dict(
+        presolve=r"^Presolve (?:removed|time)",
+        root=r"^Root relaxation:",
+        nodes=r"^\s*Nodes\s+\|",
+        cuts=r"^Cutting planes:",
+        summary=r"^Explored \d+ nodes",
+    )
+    run_marker = r"^(?:Gurobi Optimizer version|Optimize a model)"
+    fields = dict(
+        version=Field(r"Gurobi Optimizer version (\S+)", section="header"),
+        matrix=Field(
+            r"Optimize a model with {0} rows, {0} columns and {0} nonzeros",
+            content_type="int",
+            section="header",
+        ),
+        matrix_post=Field(
+            r"Presolved: {0} rows, {0} columns, {0} nonzeros",
+            content_type="int",
+            section="presolve",
+        ),
+        presolve_time=Field(
+            r"Presolve time: {0}s", content_type="float", pos=0, section="presolve"
+        ),
+        presolve=Field(
+            r"Presolve removed {0} rows and {0} columns",
+            content_type="int",
+            section="presolve",
+        ),
+        root_time=Field(
+            r"Root relaxation: objective {0}, {0} iterations, {0} seconds",
+            content_type="float",
+            pos=2,
+            section="root",
+        ),
+        stats=Field(
+            r"{1}( \(.*\))?\n(Warning:.*\n)?Best objective ({0}|-), best bound ({0}|-), gap ({0}|-)",
+            section="summary",
+        ),
+        time=Field(
+            r"Explored {0} nodes \({0} simplex iterations\) in {0} seconds",
+            content_type="float",
+            pos=2,
+            section="summary",
+        ),
+        nodes=Field(
+            r"Explored {0} nodes \({0} simplex iterations\) in {0} seconds",
+            content_type="float",
+            pos=0,
+            section="summary",
+        ),
+    )
+
+    solver_status_map = {
+        "Optimal solution found": LpStatusSolved,
+        "Solved with barrier": LpStatusSolved,
+        "Model is infeasible": LpStatusInfeasible,
+        "Model is infeasible or unbounded": LpStatusInfeasible,
+        "Time limit reached": LpStatusTimeLimit,
+        "Out of memory": LpStatusMemoryLimit,
+        "ERROR 10001": LpStatusMemoryLimit,
+        "ERROR 10003": LpStatusNotSolved,
+        "^Model is unbounded": LpStatusUnbounded,
+    }
+    progress_names = [
+        "Node",
+        "NodesLeft",
+        "Objective",
+        "Depth",
+        "IInf",
+        "BestInteger",
+        "CutsBestBound",
+        "Gap",
+        "ItpNode",
+        "Time",
+    ]
+    progress_filter = r"(^[\*H]?\s+\d.*$)"
+    # these classify each line of the node log (see process_line)
+    line_heuristic = re.compile(r"\*\s*\d+\+")
+    line_cuts = re.compile(r"Cuts: \d+")
+    line_state = re.compile(r"\*?\s*\d+\+?\s*\d+\s*(infeasible|cutoff|integral)")
+    # line_state is slow on lines without any of these words
+    line_state_words = re.compile(r"infeasible|cutoff|integral")
 
     def get_cuts(self):
         regex = r"Cutting planes:([\n\s\-\w:]+)Explored"
-        result = self.apply_regex(regex, flags=re.MULTILINE)
+        result = self.apply_regex(
+            regex, section=("cuts", "summary"), flags=re.MULTILINE
+        )
         if not result:
             # if no cuts found, return empty dictionary
             return {}
@@ -57,24 +112,9 @@ class GUROBI(LogFile):
             if s is not None and s.lastindex >= 2
         }
 
-    def get_matrix(self):
-        regex = r"Optimize a model with {0} rows, {0} columns and {0} nonzeros".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="int")
-
-    def get_matrix_post(self):
-        regex = r"Presolved: {0} rows, {0} columns, {0} nonzeros".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="int")
-
     def get_stats(self):
-        regex = r"{1}( \(.*\))?\n(Warning:.*\n)?Best objective ({0}|-), best bound ({0}|-), gap ({0}|-)".format(
-            self.numberSearch, self.wordSearch
-        )
         # content_type = ['', '', 'float', 'float', 'float']
-        solution = self.apply_regex(regex)
+        solution = self.get_field("stats")
         if solution is None:
             return None, None, None, None
 
@@ -88,55 +128,51 @@ class GUROBI(LogFile):
         progress = self.get_progress()
         if not len(progress):
             return None
-        df_filter = np.all(
-            (
-                progress.Node.str.match(r"^\*?H?\s*0"),
-                progress.NodesLeft.str.match(r"^\+?H?\s*2"),
-            ),
-            axis=0,
-        )
+        node, nodes_left = self.get_node_numbers(progress)
+        df_filter = ((node == 0) & (nodes_left == 2)).to_numpy()
+        if self.is_typed(progress):
+            if df_filter.any():
+                # we finished the cuts phase
+                return float(progress.Time[df_filter].iloc[0])
+            return float(progress.Time.iloc[0])
 
         cell = progress.Time.iloc[0]
         if len(df_filter) and any(df_filter):
             # we finished the cuts phase
             cell = progress.Time[df_filter].iloc[0]
 
-        number = re.search(self.numberSearch, cell).group(1)
+        number = self.compile(self.numberSearch).search(cell).group(1)
         return float(number)
 
     def get_lp_presolve(self):
         """
         :return: tuple  of length 3
         """
-        regex = r"Presolve time: {0}s".format(self.numberSearch)
-        time = self.apply_regex(regex, pos=0, content_type="float")
-        if time is None:
-            time = None
-        regex = r"Presolve removed {0} rows and {0} columns".format(self.numberSearch)
-        result = self.apply_regex(regex, content_type="int")
+        time = self.get_field("presolve_time")
+        result = self.get_field("presolve")
         if result is None:
             result = None, None
         return {"time": time, "rows": result[0], "cols": result[1]}
 
-    def get_time(self):
-        regex = r"Explored {0} nodes \({0} simplex iterations\) in {0} seconds".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="float", pos=2)
-
-    def get_nodes(self):
-        regex = r"Explored {0} nodes \({0} simplex iterations\) in {0} seconds".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, content_type="float", pos=0)
-
-    def get_root_time(self):
-        regex = r"Root relaxation: objective {0}, {0} iterations, {0} seconds".format(
-            self.numberSearch
-        )
-        return self.apply_regex(regex, pos=2, content_type="float")
+    @classmethod
+    def compile_line_variants(cls):
+        states = ["", "infeasible", "cutoff", "integral"]
+        return {
+            (found, heuristic, cuts, state): re.compile(
+                cls.get_line_regex(found, heuristic, cuts, state)
+            )
+            for found in [False, True]
+            for heuristic in [False, True]
+            for cuts in [False, True]
+            for state in states
+        }
 
-    def process_line(self, line):
+    @classmethod
+    def get_line_regex(cls, found, heuristic, cuts, state):
+        """
+        :param found: the line starts with * or H (a new solution was found)
+        :return: the regular expression for a kind of node line
+        """
         keys = [
             "n",
             "n_left",
@@ -149,36 +185,41 @@ class GUROBI(LogFile):
             "depth",
             "time",
         ]
-        args = {k: self.numberSearch for k in keys}
-        args["gap"] = "({}%)".format(self.number)
-        args["time"] = "({}s)".format(self.number)
+        args = {k: cls.numberSearch for k in keys}
+        args["gap"] = "({}%)".format(cls.number)
+        args["time"] = "({}s)".format(cls.number)
 
-        if line[0] in ["*", "H"]:
+        if found:
             args["obj"] = "()"
             args["iinf"] = "()"
             args["depth"] = "()"
 
-        if re.search(r"\*\s*\d+\+", line):
+        if heuristic:
             args["obj"] = "()"
             args["ItCnt"] = "()"
 
-        if re.search(r"Cuts: \d+", line):
+        if cuts:
             args["b_bound"] = r"(Cuts: \d+)"
 
-        get = re.search(r"\*?\s*\d+\+?\s*\d+\s*(infeasible|cutoff|integral)", line)
-        if get is not None:
-            state = get.group(1)
+        if state:
             args["obj"] = "({})".format(state)
             if state in ["integral"]:
                 pass
             else:
                 args["iinf"] = "()"
 
-        find = re.search(
+        return (
             r"\s+{n}\s+{n_left}\s+{obj}\s+{depth}\s+{iinf}?\s+{b_int}?-?"
-            r"\s+{b_bound}\s+{gap}?-?\s+{ItCnt}?-?\s+{time}".format(**args),
-            line,
+            r"\s+{b_bound}\s+{gap}?-?\s+{ItCnt}?-?\s+{time}".format(**args)
+        )
+
+    def get_line_kind(self, line):
+        state = None
+        if self.line_state_words.search(line):
+            state = self.line_state.search(line)
+        return (
+            line[0] in ["*", "H"],
+            self.line_heuristic.search(line) is not None,
+            self.line_cuts.search(line) is not None,
+            state.group(1) if state is not None else "",
         )
-        if not find:
-            return None
-        return find.groups()
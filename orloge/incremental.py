@@ -0,0 +1,396 @@
+import codecs
+import io
+import os
+import time
+import numpy as np
+import pandas as pd
+from .cplex import CPLEX
+from .gurobi import GUROBI
+from .cbc import CBC
+
+
+class IncrementalLog(object):
+    """
+    Push-based counterpart of LogFile, for logs that are still being written.
+    The log is given in chunks with feed and finished with close.
+    Each chunk only costs the work of its own lines: progress lines are parsed once,
+    the other lines of the node log are matched with the fields and only kept
+    if they give a value, and the lines outside the node log are kept to extract
+    the summary values (they do not grow with the search).
+    """
+
+    log_class = None
+    # values of get_log_info that need the complete progress table
+    progress_keys = ["progress", "cut_info", "first_relaxed", "first_solution"]
+    # bytes read from the file at a time by follow
+    follow_block_size = 1 << 20
+
+    def __init__(self, **options):
+        self.options = options
+        # parses the lines and gives us the regular expressions of the solver
+        self.log = self.log_class("", content=True, **options)
+        self.bytes_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.newline_decoder = io.IncrementalNewlineDecoder(None, translate=True)
+        self.pending = ""
+        self.section = "header"
+        self.markers = dict(self.log.section_markers)
+        self.node_line = self.log.compile(self.log.progress_filter)
+        self.text = []
+        self.text_changed = False
+        # sections of the fields and names of their fields (see LogFile.compile_fields)
+        self.field_sections = [
+            (section, [n for _, _, names, _ in alternatives.values() for n in names])
+            for section, (_, alternatives) in self.log._compiled_fields.items()
+        ]
+        # fields that only take their first value and were found in the node log
+        self.found = set()
+        self.rows = []
+        self.info = {}
+        self.current = dict(best_solution=None, best_bound=None)
+        self.closed = False
+
+    def feed(self, chunk):
+        """
+        parses a new part of the log.
+        Lines are only parsed when complete, so chunks can end anywhere.
+        :param chunk: str or bytes (UTF-8)
+        :return: tuple of (progress rows completed with this chunk as a pandas dataframe,
+            dictionary of the summary values that became known or changed)
+        """
+        if self.closed:
+            raise ValueError("feed() called after close()")
+        lines = (self.pending + self.decode(chunk)).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self.read_line(line)
+        return self.get_progress(self.take_rows()), self.get_new_info()
+
+    def close(self):
+        """
+        parses the last line and completes the rows that were waiting for the end of the log.
+        :return: same as feed
+        """
+        if self.closed:
+            raise ValueError("close() called twice")
+        text = self.decode(b"", final=True) + self.pending
+        self.pending = ""
+        if text:
+            self.read_line(text)
+        self.closed = True
+        info = self.get_new_info()
+        return self.get_progress(self.take_rows(final=True)), info
+
+    def decode(self, chunk, final=False) -> str:
+        """
+        decodes bytes that can end in the middle of a character
+        and translates new lines like a file opened in text mode.
+        """
+        if not isinstance(chunk, str):
+            chunk = self.bytes_decoder.decode(bytes(chunk), final=final)
+        return self.newline_decoder.decode(chunk, final=final)
+
+    def read_line(self, line):
+        """
+        keeps track of the section of the log (see LogFile.get_sections)
+        and sends the line to the progress table or to the rest of the text.
+        """
+        match = self.search_markers(line)
+        if match is not None:
+            self.section = match.lastgroup
+            self.markers.pop(self.section)
+            # the line starting the section is needed to find the sections later
+            self.add_text(line)
+        if self.section == "nodes" and self.node_line.search(line):
+            self.add_row(line)
+        elif match is None:
+            self.add_text(
+                line, keep=self.section != "nodes" or self.search_fields(line)
+            )
+
+    def search_markers(self, line):
+        """
+        :return: match where lastgroup is the section that starts with this line, or None
+        """
+        if not self.markers:
+            return None
+        regex = "|".join("(?P<{}>{})".format(k, v) for k, v in self.markers.items())
+        return self.log.compile(regex).search(line)
+
+    def add_row(self, line):
+        groups = self.log.process_line(line)
+        if groups is not None:
+            self.rows.append((groups, line))
+
+    def search_fields(self, line) -> bool:
+        """
+        matches a line of the node log with the regexes of the fields.
+        Fields that take the first value are not searched again once found.
+        :return: True if the line can give the value of a field
+        """
+        new = False
+        for section, section_names in self.field_sections:
+            if self.found.issuperset(section_names):
+                continue
+            for _, names, _ in self.log.iter_fields(section, line + "\n"):
+                for name in names:
+                    if name in self.found:
+                        continue
+                    new = True
+                    if self.log.fields[name].num == 0:
+                        self.found.add(name)
+        return new
+
+    def add_text(self, line, keep=True):
+        """
+        :param keep: if False, the line is not needed to extract the summary values
+        """
+        if keep:
+            self.text.append(line)
+            self.text_changed = True
+
+    def take_rows(self, final=False) -> list:
+        """
+        :return: the rows that are complete and were not returned yet
+        """
+        rows, self.rows = self.rows, []
+        return rows
+
+    def get_progress(self, rows) -> pd.DataFrame:
+        """
+        :param rows: list of (groups, line)
+        :return: pandas dataframe like LogFile.get_progress
+        """
+        if not rows:
+            return pd.DataFrame()
+        progress = pd.DataFrame([groups for groups, _ in rows])
+        progress.columns = self.log.progress_names
+        if self.options.get("typed_progress", False):
+            lines = [line for _, line in rows]
+            progress = self.log.get_progress_typed(progress, lines)
+        return progress
+
+    def update_current(self, progress):
+        """
+        keeps the last incumbent and bound printed in the progress table.
+        """
+        if not len(progress):
+            return
+        columns = dict(best_solution="BestInteger", best_bound="CutsBestBound")
+        for key, col in columns.items():
+            values = progress[col]
+            if not self.log.is_typed(progress):
+                values = pd.to_numeric(values, errors="coerce")
+            # HACK: CBCs magic number (1e+50) means no integer solution found
+            values = values.mask(values == 1e50).dropna()
+            if len(values):
+                self.current[key] = float(values.iloc[-1])
+
+    def get_status(self) -> dict:
+        """
+        :return: dictionary with the status, best_solution, best_bound and gap of the log.
+            Until the summary is printed, they come from the last progress rows.
+        """
+        if self.info.get("status") is not None:
+            keys = ["status", "best_solution", "best_bound", "gap"]
+            return {k: self.info.get(k) for k in keys}
+        objective, bound = self.current["best_solution"], self.current["best_bound"]
+        gap_rel = None
+        if objective is not None and bound is not None and objective != 0:
+            gap_rel = abs(objective - bound) / abs(objective) * 100
+        return dict(status=None, best_solution=objective, best_bound=bound, gap=gap_rel)
+
+    @classmethod
+    def follow(cls, path, poll_interval=1.0, timeout=None, **options):
+        """
+        follows a log while the solver writes it (like tail -f).
+        Only the bytes appended since the last poll are read and parsed (see feed).
+        If the file is truncated or replaced, the log is parsed again from the start
+        (the rows given before are not taken back).
+        :param path: path to the log, it does not need to exist yet
+        :param poll_interval: seconds between checks of the file
+        :param timeout: seconds without new lines before giving up (None: wait forever)
+        :param options: options for the parser (e.g. typed_progress)
+        :return: generator of dictionaries with the new progress rows (progress),
+            the summary values that became known or changed (info), the current
+            status, best_solution, best_bound and gap, and finished.
+            The last one has finished=True: the summary was printed and the
+            file stopped growing, or the timeout was reached.
+        """
+        log = cls(**options)
+        file = None
+        position = 0
+        last_change = time.monotonic()
+        try:
+            while True:
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    stat = None
+                if file is not None and (
+                    stat is None
+                    or stat.st_ino != os.fstat(file.fileno()).st_ino
+                    or stat.st_size < position
+                ):
+                    # rotated or truncated: a new log
+                    file.close()
+                    file = None
+                    log = cls(**options)
+                if file is None and stat is not None:
+                    file = open(path, "rb")
+                    position = 0
+                parts = []
+                info = {}
+                if file is not None:
+                    file.seek(position)
+                    for chunk in iter(lambda: file.read(cls.follow_block_size), b""):
+                        position += len(chunk)
+                        progress, new_info = log.feed(chunk)
+                        parts.append(progress)
+                        info.update(new_info)
+                now = time.monotonic()
+                if parts:
+                    last_change = now
+                elif log.info.get("status") is not None or (
+                    timeout is not None and now - last_change >= timeout
+                ):
+                    progress, new_info = log.close()
+                    yield log.get_update([progress], new_info, finished=True)
+                    return
+                if any(len(p) for p in parts) or info:
+                    yield log.get_update(parts, info)
+                time.sleep(poll_interval)
+        finally:
+            if file is not None:
+                file.close()
+
+    def get_update(self, parts, info, finished=False) -> dict:
+        """
+        :return: the dictionary that follow gives for the new progress tables and info
+        """
+        parts = [p for p in parts if len(p)]
+        progress = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+        self.update_current(progress)
+        return dict(
+            progress=progress, info=info, finished=finished, **self.get_status()
+        )
+
+    def get_log(self):
+        """
+        :return: LogFile with the lines that are kept (see add_text)
+        """
+        content = "\n".join(self.text)
+        return self.log_class(content, content=True, get_progress=False)
+
+    def get_new_info(self) -> dict:
+        """
+        :return: dictionary with the values of get_log_info (except the ones
+            that need the progress table) that became known or changed
+        """
+        if not self.text_changed:
+            return {}
+        self.text_changed = False
+        info = self.get_log().get_log_info()
+        new_info = {
+            k: v
+            for k, v in info.items()
+            if k not in self.progress_keys
+            and self.info.get(k) != v
+            and (v is not None or k in self.info)
+        }
+        self.info.update(new_info)
+        return new_info
+
+
+class IncrementalCPLEX(IncrementalLog):
+    """
+    CPLEX only prints the time every few progress lines ("Elapsed time = ...").
+    Rows wait for the next time line (or the end of the log)
+    to get their time by interpolation, as in CPLEX.get_time_column.
+    """
+
+    log_class = CPLEX
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.line_count = 0
+        self.last_time = (0, 0)
+        self.done = []
+
+    def read_line(self, line):
+        if any(start in line for start in self.log.header_log_start):
+            # a new log starts in the same file: the previous one is not finished,
+            # so its last rows keep the last time we know
+            self.release_rows((self.line_count, self.last_time[1]), final=True)
+            self.markers = dict(self.log.section_markers)
+            self.section = "header"
+            self.line_count = 0
+            self.last_time = (0, 0)
+            self.found = set()
+        super().read_line(line)
+
+    def add_row(self, line):
+        self.line_count += 1
+        groups = self.log.process_line(line)
+        if groups is not None:
+            self.rows.append((groups, line, self.line_count))
+
+    def add_text(self, line, keep=True):
+        super().add_text(line, keep)
+        if self.section != "nodes":
+            return
+        result = self.log.line_elapsed.search(line)
+        if result:
+            self.release_rows((self.line_count, float(result.group(1))))
+
+    def release_rows(self, point, final=False):
+        """
+        gives a time to the rows before point and makes them available.
+        The row at point waits for the next one: several time lines can follow
+        the same progress line and the last one is the one that counts.
+        :param point: tuple of (progress line count, time)
+        :param final: if True, the rows at point are released too
+        """
+        position, time = point
+        ready = [
+            row
+            for row in self.rows
+            if row[2] < position or final and row[2] == position
+        ]
+        self.rows = self.rows[len(ready) :]
+        if ready:
+            x = [row[2] for row in ready]
+            xp, fp = zip(self.last_time, point)
+            times = np.interp(x=x, xp=xp, fp=fp).round(2)
+            self.done.extend((g, l, t) for (g, l, _), t in zip(ready, times))
+        self.last_time = point
+
+    def take_rows(self, final=False):
+        if final and self.rows:
+            end_time = self.get_log().get_time()
+            if end_time is None:
+                self.done.extend((g, l, None) for g, l, _ in self.rows)
+                self.rows = []
+            else:
+                self.release_rows((self.line_count, end_time), final=True)
+        rows, self.done = self.done, []
+        return rows
+
+    def get_progress(self, rows):
+        progress = super().get_progress([(g, l) for g, l, _ in rows])
+        if len(progress):
+            times = [t for _, _, t in rows]
+            if self.log.is_typed(progress):
+                times = np.array(times, dtype="float64")
+            else:
+                # we coerce to string to match the other solvers output:
+                times = [None if t is None else str(t) for t in times]
+            progress.insert(len(self.log.progress_names), "Time", times)
+        return progress
+
+
+class IncrementalGUROBI(IncrementalLog):
+    log_class = GUROBI
+
+
+class IncrementalCBC(IncrementalLog):
+    log_class = CBC
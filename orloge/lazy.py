@@ -0,0 +1,20 @@
+import importlib
+
+
+class LazyModule(object):
+    """
+    Stands for a module that is only imported when one of its attributes is used,
+    e.g. pd = LazyModule("pandas") does not import pandas until pd.DataFrame is needed.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+
+    def __getattr__(self, attr):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return getattr(self.module, attr)
+
+    def __repr__(self):
+        return "LazyModule({})".format(self.name)
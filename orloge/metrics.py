@@ -0,0 +1,196 @@
+"""
+Metrics to compare runs, computed from the progress table of get_log_info.
+The incumbent (BestInteger) and bound (CutsBestBound) are step functions of Time:
+a row gives their value from its time until the time of the next row.
+Integrals follow Berthold (2013): gaps are in [0, 1] and are 1 while there is no value.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def get_table(progress) -> pd.DataFrame:
+    """
+    :param progress: progress table in any progress_format
+        (pandas, records, numpy, arrow or polars, see orloge.formats)
+    :return: the table as a pandas dataframe
+    """
+    if isinstance(progress, pd.DataFrame):
+        return progress
+    if isinstance(progress, (dict, np.ndarray)):
+        return pd.DataFrame(progress)
+    if hasattr(progress, "to_pandas"):
+        # pyarrow Table and polars DataFrame
+        return progress.to_pandas()
+    raise TypeError(
+        "progress must be a table of a progress_format (pandas, records, numpy, "
+        f"arrow or polars), not {type(progress).__name__}"
+    )
+
+
+def get_numbers(progress) -> pd.DataFrame:
+    """
+    converts the Time, BestInteger and CutsBestBound columns of any progress table
+    (text, typed or CPSAT) into float64 columns.
+    Rows without time are dropped and missing values keep the previous one.
+    :param progress: table from get_progress or get_log_info
+    :return: pandas dataframe with Time, BestInteger and CutsBestBound columns
+    """
+    columns = {}
+    for col in ["Time", "BestInteger", "CutsBestBound"]:
+        values = progress[col]
+        if not pd.api.types.is_numeric_dtype(values):
+            # "12.5%", "35s", "Cuts: 12", None
+            values = values.astype("str").str.strip().str.rstrip("%s")
+        numbers = pd.to_numeric(values, errors="coerce").astype("float64")
+        # HACK: CBCs magic number (1e+50) means no integer solution found
+        columns[col] = numbers.mask(numbers.abs() == 1e50)
+    numbers = pd.DataFrame(columns).dropna(subset=["Time"]).ffill()
+    return numbers.reset_index(drop=True)
+
+
+def get_gap(value, reference) -> np.ndarray:
+    """
+    relative gap between two arrays as in the primal integral:
+    0 if both are 0, 1 if one is missing or they have different signs.
+    :return: array with values in [0, 1]
+    """
+    value = np.asarray(value, dtype="float64")
+    reference = np.asarray(reference, dtype="float64")
+    diff = np.abs(value - reference)
+    scale = np.maximum(np.abs(value), np.abs(reference))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = np.where(scale == 0, 0.0, diff / scale)
+    gap[value * reference < 0] = 1
+    gap[np.isnan(value) | np.isnan(reference)] = 1
+    return gap
+
+
+def get_integral(times, gaps, end_time=None) -> float:
+    """
+    integral of a step function from 0 to end_time.
+    The gap is 1 before the first time.
+    :param times: sorted array with the time of each value
+    :param gaps: array with the value from each time until the next one
+    :param end_time: end of the integral (by default, the last time)
+    :return: integral
+    """
+    times = np.asarray(times, dtype="float64")
+    if end_time is None:
+        end_time = times[-1] if len(times) else 0
+    times = np.clip(times, 0, end_time)
+    limits = np.append(times, end_time)
+    return float(limits[0] + np.sum(gaps * np.diff(limits)))
+
+
+def get_primal_integral(progress, reference, end_time=None) -> float | None:
+    """
+    :param progress: table from get_progress or get_log_info (any progress_format)
+    :param reference: optimal (or best known) objective value
+    :param end_time: end of the run (by default, the time of the last row)
+    :return: integral of the primal gap over time
+    """
+    progress = get_table(progress)
+    if reference is None or not len(progress):
+        return None
+    numbers = get_numbers(progress)
+    gaps = get_gap(numbers.BestInteger, reference)
+    return get_integral(numbers.Time, gaps, end_time)
+
+
+def get_dual_integral(progress, reference, end_time=None) -> float | None:
+    """
+    :param progress: table from get_progress or get_log_info (any progress_format)
+    :param reference: optimal (or best known) objective value
+    :param end_time: end of the run (by default, the time of the last row)
+    :return: integral of the dual gap over time
+    """
+    progress = get_table(progress)
+    if reference is None or not len(progress):
+        return None
+    numbers = get_numbers(progress)
+    gaps = get_gap(numbers.CutsBestBound, reference)
+    return get_integral(numbers.Time, gaps, end_time)
+
+
+def get_primal_dual_integral(progress, end_time=None) -> float | None:
+    """
+    :param progress: table from get_progress or get_log_info (any progress_format)
+    :param end_time: end of the run (by default, the time of the last row)
+    :return: integral of the gap between incumbent and bound over time
+    """
+    progress = get_table(progress)
+    if not len(progress):
+        return None
+    numbers = get_numbers(progress)
+    gaps = get_gap(numbers.BestInteger, numbers.CutsBestBound)
+    return get_integral(numbers.Time, gaps, end_time)
+
+
+def get_first_solution_time(progress) -> float | None:
+    """
+    :param progress: table from get_progress or get_log_info (any progress_format)
+    :return: time of the first row with an incumbent
+    """
+    progress = get_table(progress)
+    if not len(progress):
+        return None
+    numbers = get_numbers(progress)
+    found = numbers.Time[numbers.BestInteger.notna()]
+    if not len(found):
+        return None
+    return float(found.iloc[0])
+
+
+def get_time_to_gaps(progress, gaps) -> dict:
+    """
+    times when the gap reported by the solvers (in %, relative to the incumbent)
+    reaches each threshold.
+    :param progress: table from get_progress or get_log_info (any progress_format)
+    :param gaps: list of gaps in %
+    :return: dictionary of gap: time (None if it was not reached)
+    """
+    progress = get_table(progress)
+    if not len(progress):
+        return {gap: None for gap in gaps}
+    numbers = get_numbers(progress)
+    diff = np.abs(numbers.BestInteger - numbers.CutsBestBound).values
+    scale = np.abs(numbers.BestInteger).values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        current = np.where(diff == 0, 0.0, diff / scale * 100)
+    current[np.isnan(current)] = np.inf
+    # the gap only goes down: the first time it is below each threshold
+    best = np.minimum.accumulate(current)
+    thresholds = np.asarray(gaps, dtype="float64")
+    positions = np.searchsorted(-best, -thresholds, side="left")
+    times = numbers.Time.values
+    return {
+        gap: float(times[p]) if p < len(times) else None
+        for gap, p in zip(gaps, positions)
+    }
+
+
+def get_metrics(result, reference=None, gaps=(), end_time=None) -> dict:
+    """
+    computes all the metrics of a run.
+    :param result: output of get_log_info (with the progress table,
+        in any progress_format)
+    :param reference: optimal (or best known) objective value.
+        By default, the best_solution of the run.
+    :param gaps: list of gaps in % for time_to_gap
+    :param end_time: end of the run. By default, the time of the run.
+    :return: dictionary with primal_integral, dual_integral, primal_dual_integral,
+        first_solution_time and time_to_gap (dictionary of gap: time)
+    """
+    progress = get_table(result["progress"])
+    if reference is None:
+        reference = result["best_solution"]
+    if end_time is None:
+        end_time = result["time"]
+    return {
+        "primal_integral": get_primal_integral(progress, reference, end_time),
+        "dual_integral": get_dual_integral(progress, reference, end_time),
+        "primal_dual_integral": get_primal_dual_integral(progress, end_time),
+        "first_solution_time": get_first_solution_time(progress),
+        "time_to_gap": get_time_to_gaps(progress, gaps),
+    }
@@ -0,0 +1,133 @@
+"""
+Downsampling of the progress table (see the progress_max_rows option).
+Rows are read one at a time and at most 2 * max_rows of them are kept in memory.
+"""
+
+
+def to_number(text) -> float | None:
+    """
+    :return: the number in a cell of the text progress table ("12.5%", "35s")
+        or None if there is none (e.g. "Cuts: 12")
+    """
+    try:
+        number = float(text.strip().rstrip("%s"))
+    except (AttributeError, ValueError):
+        return None
+    # HACK: CBCs magic number (1e+50) means no integer solution found
+    if abs(number) == 1e50:
+        return None
+    return number
+
+
+def get_gap(incumbent, bound) -> float:
+    """
+    relative gap in [0, 1] as in orloge.metrics.get_gap
+    """
+    if incumbent is None or bound is None or incumbent * bound < 0:
+        return 1
+    scale = max(abs(incumbent), abs(bound))
+    if scale == 0:
+        return 0
+    return abs(incumbent - bound) / scale
+
+
+def lttb(points, num) -> list:
+    """
+    largest triangle three buckets: chooses num points that keep the shape of a curve.
+    :param points: list of (x, y, ...) sorted by x
+    :param num: number of points to keep
+    :return: list with num points, including the first and the last one
+    """
+    if num >= len(points):
+        return points
+    if num < 3:
+        return [points[0], points[-1]][:num]
+    x = [p[0] for p in points]
+    y = [p[1] for p in points]
+    # num - 2 buckets between the first and the last point
+    edges = [1 + i * (len(points) - 2) // (num - 2) for i in range(num - 1)]
+    edges.append(len(points))
+    selected = [0]
+    for i in range(num - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        next_x = sum(x[end:next_end]) / (next_end - end)
+        next_y = sum(y[end:next_end]) / (next_end - end)
+        ax, ay = x[selected[-1]], y[selected[-1]]
+        selected.append(
+            max(
+                range(start, end),
+                key=lambda j: abs(
+                    (ax - next_x) * (y[j] - ay) - (ax - x[j]) * (next_y - ay)
+                ),
+            )
+        )
+    selected.append(len(points) - 1)
+    return [points[i] for i in selected]
+
+
+def downsample(points, num) -> list:
+    """
+    keeps num points: the ones marked to keep and the rest chosen with lttb.
+    :param points: list of (x, y, keep, ...) sorted by x
+    :return: list with at most num points, sorted by x
+    """
+    if len(points) <= num:
+        return points
+    forced = [p for p in points if p[2]]
+    if len(forced) >= num:
+        return lttb(forced, num)
+    others = lttb([p for p in points if not p[2]], num - len(forced))
+    return sorted(forced + others, key=lambda p: p[0])
+
+
+class ProgressSampler(object):
+    """
+    Keeps at most max_rows rows of a progress table that is read row by row.
+    Rows where neither the incumbent nor the bound change are dropped.
+    The first row, the last row and the rows with a new incumbent are kept
+    (while they fit). The rest are chosen with lttb on the curve of the gap.
+    """
+
+    def __init__(self, max_rows):
+        if max_rows < 2:
+            raise ValueError("progress_max_rows needs to be at least 2")
+        self.max_rows = max_rows
+        self.points = []
+        self.last = None
+        self.incumbent = self.bound = None
+
+    def add(self, position, incumbent, bound, row):
+        """
+        :param position: position of the row in the table
+        :param incumbent: value of the best solution in the row or None
+        :param bound: value of the bound in the row or None
+        :param row: anything to return for this row
+        """
+        first = self.last is None
+        new_incumbent = incumbent is not None and incumbent != self.incumbent
+        new_bound = bound is not None and bound != self.bound
+        if incumbent is not None:
+            self.incumbent = incumbent
+        if bound is not None:
+            self.bound = bound
+        point = (
+            position,
+            get_gap(self.incumbent, self.bound),
+            first or new_incumbent,
+            row,
+        )
+        self.last = point
+        if not (first or new_incumbent or new_bound):
+            return
+        self.points.append(point)
+        if len(self.points) >= 2 * self.max_rows:
+            self.points = downsample(self.points, self.max_rows)
+
+    def get_rows(self) -> list:
+        """
+        :return: list of (position, row) of the rows that are kept
+        """
+        points = [p for p in self.points if p is not self.last]
+        if self.last is not None:
+            points.append(self.last[:2] + (True,) + self.last[3:])
+        return [(p[0], p[3]) for p in downsample(points, self.max_rows)]
@@ -1,10 +1,12 @@
 import unittest
+from unittest import mock
 import os
 import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import orloge as ol
+from orloge import detection
 
 DATADIR = os.path.join(os.path.dirname(__file__), "data")
 ALMOST_KEYS = ["best_solution", "best_bound"]
@@ -38,6 +40,53 @@ class SolverTest(unittest.TestCase):
         my_log = MyLog(path=None, content="PATH_TO_MY_LOG_FILE")
         my_log.get_log_info()
 
+    def test_new_log_fields(self):
+        class MyLog(ol.LogFile):
+            name = "my_solver"
+            section_markers = dict(summary=r"^Finished")
+            fields = dict(
+                version=ol.Field(r"My solver v(\S+)", section="header"),
+                time=ol.Field(
+                    r"Finished in {0} seconds, {0} nodes",
+                    content_type="float",
+                    pos=0,
+                    section="summary",
+                ),
+                nodes=ol.Field(
+                    r"Finished in {0} seconds, {0} nodes",
+                    content_type="int",
+                    pos=1,
+                    section="summary",
+                ),
+            )
+
+        content = "My solver v1.2\nsolving...\nFinished in 3.5 seconds, 10 nodes\n"
+        my_log = MyLog(content, content=True)
+        self.assertEqual(
+            my_log.get_fields(), {"version": "1.2", "time": 3.5, "nodes": 10}
+        )
+        info = my_log.get_log_info()
+        self.assertEqual(info["time"], 3.5)
+        self.assertEqual(info["nodes"], 10)
+
+    def test_new_log_signatures(self):
+        # the subclass registers itself: we restore the table afterwards
+        signatures = list(detection.signatures)
+        with (
+            mock.patch.object(detection, "signatures", signatures),
+            mock.patch.object(detection, "_compiled", []),
+        ):
+
+            class MyLog(ol.LogFile):
+                name = "my_solver"
+                signatures = [r"^My solver v\d"]
+                fields = dict(version=ol.Field(r"My solver v(\S+)", section="header"))
+
+            content = "My solver v1.2\nsolving...\n"
+            info = ol.get_info_solver(content, content=True)
+        self.assertEqual(info["solver"], "my_solver")
+        self.assertEqual(info["version"], "1.2")
+
 
 if __name__ == "__main__":
     unittest.main()